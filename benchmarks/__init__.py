@@ -0,0 +1 @@
+"""Benchmarks hors ligne (aucune connexion à Discord). Lancer depuis la racine : python -m benchmarks.<nom>."""
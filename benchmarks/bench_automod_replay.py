@@ -0,0 +1,187 @@
+"""Rejeu hors ligne d'un flux de messages dans AutoModeration.handle_message.
+
+Mesure le débit (messages/s), les percentiles de latence par message et le
+nombre de déclenchements par règle, avec les règles de modération actuelles
+(data/moderation_rules.json ou config_moderation.py). Les suppressions et
+envois sont simulés ; aucune connexion n'est nécessaire.
+
+Le corpus est synthétique par défaut. `--corpus` rejoue un fichier JSONL,
+une ligne par message :
+    {"t": 12.5, "channel": 1, "author": 42, "monitored": true,
+     "content": "hello", "mentions": 0, "embeds": ["https://..."]}
+Seul `content` est obligatoire. `t` (secondes) alimente l'horloge des
+fenêtres anti-flood, ce qui rend le rejeu indépendant de sa vitesse.
+
+Usage : python -m benchmarks.bench_automod_replay [--messages 20000] [--rate 20] [--corpus fichier.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import random
+
+from commands.auto_moderation import AutoModeration
+from utils.quota import DailyQuota
+from benchmarks.fakes import (
+    FakeBot,
+    FakeGuild,
+    FakeMember,
+    FakeMessage,
+    FakeRole,
+    FakeTextChannel,
+    RestCounter,
+    Timer,
+    percentile,
+)
+
+# Modèles du corpus synthétique, avec leur poids
+SYNTHETIC_TEMPLATES = [
+    (60, "just finished the new sprite sheet for level {n}, what do you think?"),
+    (10, "hello everyone, I'm new here"),
+    (5, "is this a good investment for the future?"),
+    (5, "check our site https://pirpg.netlify.app/pi"),
+    (4, "free nitro at [discord.gift](https://free-nitro.ru/claim?id={n})"),
+    (4, "go to evil-site.xyz/promo{n} now"),
+    (3, "join discord.gg/abc{n}"),
+    (3, "this is badword1 honestly"),
+    (3, "hey {mention} look at this"),
+    (3, "www.example.com/page{n}"),
+    # Discussion ordinaire qui ressemble à un domaine nu : ne doit rien supprimer
+    (2, "welcome.to the team, nice job.me too"),
+    (2, "I love it.it is great, done.de rien"),
+]
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def synthetic_corpus(count: int, rate: float, channels: int, authors: int, monitored_share: float, seed: int = 0):
+    rng = random.Random(seed)
+    weights = [w for w, _ in SYNTHETIC_TEMPLATES]
+    monitored_authors = max(1, int(authors * monitored_share))
+    for i in range(count):
+        template = rng.choices(SYNTHETIC_TEMPLATES, weights)[0][1]
+        author = rng.randrange(authors)
+        yield {
+            "t": i / rate,
+            "channel": rng.randrange(channels),
+            "author": author,
+            "monitored": author < monitored_authors,
+            "content": template.format(n=i, mention=f"<@{author + 1}>"),
+            "mentions": int("{mention}" in template),
+        }
+
+
+def load_corpus(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f):
+            if line.strip():
+                record = json.loads(line)
+                record.setdefault("t", float(number))
+                yield record
+
+
+class _Embed:
+    def __init__(self, url):
+        self.url = url
+
+
+def build_messages(records, monitored_role_ids):
+    """Construit les faux objets à l'avance : seule la modération est chronométrée."""
+    rest = RestCounter()
+    monitored = [FakeRole(role_id, "monitored") for role_id in monitored_role_ids]
+    member_role = FakeRole(name="member")
+    guild = FakeGuild(roles=[member_role, *monitored])
+    channels, members, messages = {}, {}, []
+    for record in records:
+        channel_key = record.get("channel", 0)
+        channel = channels.get(channel_key)
+        if channel is None:
+            channel = channels[channel_key] = FakeTextChannel(name=f"replay-{channel_key}", rest=rest, guild=guild)
+        author_key = (record.get("author", 0), bool(record.get("monitored", True)))
+        author = members.get(author_key)
+        if author is None:
+            roles = [member_role, *monitored] if author_key[1] else [member_role]
+            author = members[author_key] = FakeMember(guild, roles=roles)
+        mentions = [author] * int(record.get("mentions", 0))
+        message = FakeMessage(
+            channel,
+            embeds=[_Embed(url) for url in record.get("embeds", [])],
+            content=record.get("content", ""),
+            author=author,
+            mentions=mentions,
+        )
+        messages.append((float(record.get("t", 0.0)), message))
+    return messages, channels, rest
+
+
+async def replay(messages, channels, rest: RestCounter, cog: AutoModeration):
+    clock = SimClock()
+    cog.clock = clock
+    latencies = []
+    with Timer() as total:
+        for timestamp, message in messages:
+            clock.now = timestamp
+            with Timer() as timer:
+                await cog.handle_message(message)
+            latencies.append(timer.elapsed)
+    # Suppressions groupées du mode raid encore en attente (hors chronométrage)
+    if cog._flush_tasks:
+        await asyncio.gather(*cog._flush_tasks)
+
+    deleted = sum(message.deleted for _, message in messages)
+    sent = sum(len(channel.sent) for channel in channels.values())
+    return total.elapsed, latencies, deleted, sent, rest.calls
+
+
+async def run(records, label: str):
+    cog = AutoModeration(FakeBot())
+    # Quotas vierges : le rejeu ne dépend pas de l'état du jour sur disque
+    cog._quota = DailyQuota()
+    messages, channels, rest = build_messages(records, cog.rules.role_ids)
+    if not messages:
+        print("Corpus vide.")
+        return
+    elapsed, latencies, deleted, sent, calls = await replay(messages, channels, rest, cog)
+
+    count = len(messages)
+    print(f"\nCorpus : {label} — {count} messages, {len(channels)} salons, règles : {cog.rules.source}")
+    print(f"Débit : {count / elapsed:,.0f} messages/s ({elapsed * 1000:.0f} ms au total)")
+    print(
+        "Latence par message : "
+        f"p50 {percentile(latencies, 50) * 1e6:.1f} µs, p95 {percentile(latencies, 95) * 1e6:.1f} µs, "
+        f"p99 {percentile(latencies, 99) * 1e6:.1f} µs, max {max(latencies) * 1e6:.1f} µs"
+    )
+    print(f"Actions simulées : {deleted} messages supprimés, {sent} messages envoyés, {calls} appels REST")
+
+    # Statistiques par règle relevées par le cog lui-même (mêmes chiffres que /modstats)
+    snapshot = cog.metrics.snapshot()
+    print(f"\n{'règle':<28} {'évaluations':>12} {'déclenchements':>15} {'p95 µs':>8}")
+    for rule, stats in sorted(snapshot["rules"].items(), key=lambda item: -item[1]["hits"]):
+        print(f"{rule:<28} {stats['evaluations']:>12} {stats['hits']:>15} {stats['p95_us']:>8.0f}")
+    print("\n" + ", ".join(f"{name}: {value}" for name, value in sorted(snapshot["counters"].items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="fichier JSONL à rejouer (sinon corpus synthétique)")
+    parser.add_argument("--messages", type=int, default=20000, help="taille du corpus synthétique")
+    parser.add_argument("--rate", type=float, default=20.0, help="messages/s simulés dans le corpus synthétique")
+    parser.add_argument("--channels", type=int, default=10, help="salons du corpus synthétique")
+    parser.add_argument("--authors", type=int, default=500, help="auteurs du corpus synthétique")
+    parser.add_argument("--monitored", type=float, default=0.3, help="part des auteurs ayant un rôle surveillé")
+    args = parser.parse_args()
+    if args.corpus:
+        records, label = list(load_corpus(args.corpus)), args.corpus
+    else:
+        records = list(synthetic_corpus(args.messages, args.rate, args.channels, args.authors, args.monitored))
+        label = "synthétique"
+    asyncio.run(run(records, label))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark des recherches de tâches de /task et /updatetask sur un historique simulé.
+
+Compare, pour 100, 1k et 10k tâches réparties dans les salons de tâches :
+- `legacy` : l'ancienne boucle (history(limit=100) salon par salon) ;
+- `scan` : la recherche de secours concurrente de TaskIndex (index vide) ;
+- `indexed` : TaskIndex.update_fields avec un index rempli par le backfill.
+
+Usage : python -m benchmarks.bench_task_lookup [--sizes 100,1000,10000] [--latency 0.02] [--lookups 50]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+
+import discord
+import config
+from commands.task_index import (
+    ASSIGNEE_FIELD,
+    ASSIGNEE_FIELD_INDEX,
+    STATUS_FIELD,
+    TaskIndex,
+)
+from benchmarks.fakes import FakeBot, FakeMessage, FakeTextChannel, RestCounter, Timer, percentile
+
+
+def task_embed(title: str) -> discord.Embed:
+    embed = discord.Embed(title=title, description="benchmark", color=0xF4E3C7)
+    embed.add_field(name=ASSIGNEE_FIELD, value="None", inline=True)
+    embed.add_field(name=STATUS_FIELD, value="To Do", inline=True)
+    return embed
+
+
+def seed(size: int, latency: float):
+    rest = RestCounter(latency)
+    channels = [FakeTextChannel(cid, name, rest) for name, cid in config.TASKS_CHANNEL_ID.items()]
+    titles = []
+    for i in range(size):
+        channel = channels[i % len(channels)]
+        title = f"Task {i:05d}"
+        channel.seed(FakeMessage(channel, embeds=[task_embed(title)]))
+        titles.append(title)
+    return FakeBot(channels), rest, titles
+
+
+async def legacy_lookup(bot, title: str):
+    """Reproduction de la boucle d'origine de commands/task.py."""
+    for channel_id in config.TASKS_CHANNEL_ID.values():
+        channel = bot.get_channel(channel_id)
+        async for message in channel.history(limit=100):
+            if message.embeds:
+                embed = message.embeds[0]
+                if embed.title.strip() == f"{title}":
+                    embed.set_field_at(0, name=ASSIGNEE_FIELD, value="<@1>", inline=True)
+                    await message.edit(embed=embed)
+                    return message
+    return None
+
+
+async def measure(name: str, lookup, rest: RestCounter, titles, lookups: int):
+    random.seed(0)
+    targets = [random.choice(titles) for _ in range(lookups)]
+    latencies = []
+    found = 0
+    rest.calls = 0
+    for title in targets:
+        with Timer() as timer:
+            message = await lookup(title)
+        latencies.append(timer.elapsed)
+        found += message is not None
+    return {
+        "path": name,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "rest_per_lookup": rest.calls / lookups,
+        "found": f"{found}/{lookups}",
+    }
+
+
+async def run(sizes, latency: float, lookups: int):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            bot, rest, titles = seed(size, latency)
+            rows.append((size, await measure("legacy", lambda t: legacy_lookup(bot, t), rest, titles, lookups)))
+
+            empty = TaskIndex(bot, path=os.path.join(tmp, f"empty-{size}.json"))
+            rows.append((size, await measure("scan", empty._scan_channels, rest, titles, lookups)))
+
+            index = TaskIndex(bot, path=os.path.join(tmp, f"index-{size}.json"))
+            rest.calls = 0
+            with Timer() as backfill:
+                for channel in bot.channels.values():
+                    await index._backfill_channel(channel)
+            print(f"[{size}] backfill: {backfill.elapsed * 1000:.0f} ms, {rest.calls} REST calls (once)")
+
+            async def indexed(title, index=index):
+                return await index.update_fields(title, {ASSIGNEE_FIELD_INDEX: (ASSIGNEE_FIELD, "<@1>")})
+            rows.append((size, await measure("indexed", indexed, rest, titles, lookups)))
+
+    print(f"\n{'tasks':>6} {'path':<8} {'p50 ms':>9} {'p95 ms':>9} {'REST/lookup':>12} {'found':>8}")
+    for size, row in rows:
+        print(f"{size:>6} {row['path']:<8} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['rest_per_lookup']:>12.1f} {row['found']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="nombres de tâches, séparés par des virgules")
+    parser.add_argument("--latency", type=float, default=0.02, help="latence simulée par appel REST (s)")
+    parser.add_argument("--lookups", type=int, default=50, help="recherches par scénario")
+    args = parser.parse_args()
+    asyncio.run(run([int(s) for s in args.sizes.split(",")], args.latency, args.lookups))
+
+
+if __name__ == "__main__":
+    main()
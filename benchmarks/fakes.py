@@ -0,0 +1,191 @@
+"""Faux objets Discord pour les benchmarks : latence simulée et comptage des appels REST."""
+import asyncio
+import itertools
+import time
+
+import discord
+
+
+class RestCounter:
+    """Compte les appels REST simulés et applique une latence fixe à chacun."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def call(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+_ids = itertools.count(1)
+
+
+def next_id() -> int:
+    """IDs croissants, comme des snowflakes (plus récent = plus grand)."""
+    return next(_ids)
+
+
+class FakeRole:
+    def __init__(self, role_id=None, name="role"):
+        self.id = role_id or next_id()
+        self.name = name
+
+
+class FakeGuild:
+    def __init__(self, guild_id=None, roles=()):
+        self.id = guild_id or next_id()
+        self.roles = list(roles)
+
+
+class FakeMember:
+    def __init__(self, guild, member_id=None, roles=(), bot=False):
+        self.id = member_id or next_id()
+        self.guild = guild
+        self.roles = list(roles)
+        self.bot = bot
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+
+class FakeMessage:
+    def __init__(self, channel, embeds=(), content="", author=None, mentions=(), role_mentions=(),
+                 mention_everyone=False, message_id=None):
+        self.id = message_id or next_id()
+        self.channel = channel
+        self.guild = getattr(channel, "guild", None)
+        self.author = author
+        self.content = content
+        self.embeds = list(embeds)
+        self.attachments = []
+        self.mentions = list(mentions)
+        self.role_mentions = list(role_mentions)
+        self.raw_role_mentions = [r.id for r in self.role_mentions]
+        self.mention_everyone = mention_everyone
+        self.deleted = False
+
+    async def edit(self, embed=None, **kwargs):
+        await self.channel.rest.call()
+        if embed is not None:
+            self.embeds = [embed]
+        return self
+
+    async def delete(self):
+        await self.channel.rest.call()
+        self.deleted = True
+
+    async def add_reaction(self, emoji):
+        await self.channel.rest.call()
+
+
+class FakePartialMessage:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def fetch(self):
+        await self.channel.rest.call()
+        message = self.channel.by_id.get(self.id)
+        if message is None:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message")
+        return message
+
+
+class _FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "Not Found"
+
+
+class FakeTextChannel:
+    """Salon dont `history` pagine par 100 messages, un appel REST par page."""
+
+    PAGE_SIZE = 100
+
+    def __init__(self, channel_id=None, name="general", rest=None, guild=None, category=None):
+        self.id = channel_id or next_id()
+        self.name = name
+        self.guild = guild
+        self.category = category
+        self.rest = rest or RestCounter()
+        self.messages = []  # du plus ancien au plus récent
+        self.by_id = {}
+        self.sent = []
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+    def seed(self, message):
+        self.messages.append(message)
+        self.by_id[message.id] = message
+        return message
+
+    async def history(self, limit=100, before=None, after=None, oldest_first=None):
+        before_id = getattr(before, "id", None)
+        after_id = getattr(after, "id", None)
+        remaining = limit if limit is not None else float("inf")
+        selected = [
+            m for m in reversed(self.messages)
+            if (before_id is None or m.id < before_id) and (after_id is None or m.id > after_id)
+        ]
+        # Comme discord.py : du plus ancien au plus récent par défaut quand `after` est donné
+        if oldest_first if oldest_first is not None else after_id is not None:
+            selected.reverse()
+        position = 0
+        while remaining > 0 and position < len(selected):
+            # Un appel REST par page de 100 messages
+            await self.rest.call()
+            page = selected[position:position + min(self.PAGE_SIZE, remaining)]
+            position += len(page)
+            remaining -= len(page)
+            for message in page:
+                yield message
+
+    def get_partial_message(self, message_id):
+        return FakePartialMessage(self, message_id)
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.call()
+        self.sent.append(content)
+        return FakeMessage(self, content=content or "")
+
+    async def delete_messages(self, messages):
+        await self.rest.call()
+        for message in messages:
+            message.deleted = True
+
+
+class FakeBot:
+    def __init__(self, channels=()):
+        self.channels = {c.id: c for c in channels}
+        self.user = None
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_cog(self, name):
+        return None
+
+    async def wait_until_ready(self):
+        return None
+
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -1,10 +1,13 @@
 import os
 import json
+import signal
+import asyncio
 from datetime import datetime
 
 import discord
 from discord.ext import commands
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from utils.http import create_http_session
 
 # ✅ Charger .env uniquement en local (Railway injecte déjà les variables)
 if os.path.exists(".env"):
@@ -35,7 +38,32 @@ if not TOKEN:
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True 
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+
+# ✅ Bot avec un client HTTP partagé (pool de connexions) pour tous les cogs
+class PiBot(commands.Bot):
+    http_session = None
+
+    async def setup_hook(self):
+        self.http_session = create_http_session()
+        # ✅ SIGTERM (redéploiement) : fermeture propre pour que les cogs enregistrent leur état
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except NotImplementedError:
+            # Windows : pas de gestionnaire de signaux dans la boucle asyncio
+            pass
+
+    def _on_sigterm(self):
+        print("🛑 SIGTERM reçu, arrêt du bot...")
+        self._close_task = asyncio.create_task(self.close())
+
+    async def close(self):
+        await super().close()
+        if self.http_session is not None:
+            await self.http_session.close()
+
+
+bot = PiBot(command_prefix="!", intents=intents)
 
 
 # ✅ Fonction pour charger dynamiquement les extensions dans /commands
@@ -2,9 +2,9 @@ import os
 import discord
 from discord import app_commands
 from discord.ext import commands
-import aiohttp
 import io
 from dotenv import load_dotenv
+from utils.http import get_http_session
 
 if os.path.exists(".env"):
     load_dotenv()
@@ -29,12 +29,11 @@ class GithubBrowse(commands.Cog):
             "Accept": "application/vnd.github.v3+json"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    await interaction.response.send_message("❌ Cannot access the GitHub repository.", ephemeral=True)
-                    return
-                data = await resp.json()
+        async with get_http_session(self.bot).get(url, headers=headers) as resp:
+            if resp.status != 200:
+                await interaction.response.send_message("❌ Cannot access the GitHub repository.", ephemeral=True)
+                return
+            data = await resp.json()
 
         files = [item for item in data if item['type'] == "file"]
         dirs = [item for item in data if item['type'] == "dir"]
@@ -134,12 +133,11 @@ class GithubBrowseSelect(discord.ui.Select):
                 "Authorization": f"Bearer {GITHUB_TOKEN}",
                 "Accept": "application/vnd.github.v3.raw"
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    if resp.status != 200:
-                        await interaction.response.send_message("❌ Cannot retrieve the file.", ephemeral=True)
-                        return
-                    file_bytes = await resp.read()
+            async with get_http_session(self.cog.bot).get(url, headers=headers) as resp:
+                if resp.status != 200:
+                    await interaction.response.send_message("❌ Cannot retrieve the file.", ephemeral=True)
+                    return
+                file_bytes = await resp.read()
 
             file = discord.File(fp=io.BytesIO(file_bytes), filename=item['name'])
             await interaction.response.send_message(f"Here is the file **{item['name']}**:", file=file, ephemeral=True)
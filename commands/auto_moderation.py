@@ -1,20 +1,31 @@
-import re
-import os
-import json
+import time
 import random
-from datetime import date
-
+import asyncio
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 from config_moderation import (
-    MOD_ROLE_IDS,
-    MOD_BANNED_WORDS,
-    MOD_BLOCK_LINKS,
-    MOD_BLOCK_MENTIONS,
-    MOD_WARNING_MESSAGE,
-    AUTO_RESPONSE_GROUPS,
+    MOD_RULES_FILE,
+    MOD_FLOOD_USER_LIMIT,
+    MOD_FLOOD_USER_WINDOW,
+    MOD_RAID_CHANNEL_LIMIT,
+    MOD_RAID_CHANNEL_WINDOW,
+    MOD_RAID_DURATION,
+    MOD_BULK_DELETE_DELAY,
+    MOD_WARNING_WINDOW,
+    MOD_TRACE_SIZE,
+    MOD_TRACE_SAMPLE_RATE,
+    MOD_TRACE_CONTENT_CHARS,
     AUTO_RESPONSE_STATE_FILE,
+    AUTO_RESPONSE_FLUSH_SECONDS,
 )
+from utils.moderation_rules import CompiledRules, load_rules, validate_rules
+from utils.quota import DailyQuota
+from utils.role_cache import ensure_role_cache, member_roles
+from utils.message_pipeline import TICKET, pipeline
+from utils.metrics import DecisionTrace, Metrics
+from utils.rate_limit import SlidingWindowCounter
+from utils.state_store import JsonStateStore
 
 
 class AutoModeration(commands.Cog):
@@ -24,154 +35,303 @@ class AutoModeration(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.link_regex = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
-        # State pour quotas journaliers
-        self._state_file = AUTO_RESPONSE_STATE_FILE
-        self._state = self._load_state()
-
-    def _author_has_monitored_role(self, member: discord.Member) -> bool:
+        # Règles compilées (automate unique + ensembles de rôles), remplacées d'un bloc par /reloadmoderation
         try:
-            author_roles = {r.id for r in member.roles}
-            return any(rid in author_roles for rid in MOD_ROLE_IDS)
-        except Exception:
-            return False
+            self.rules = load_rules(MOD_RULES_FILE)
+        except Exception as e:
+            print(f"[AutoModeration] Règles {MOD_RULES_FILE} invalides ({e}), utilisation de config_moderation.py")
+            self.rules = CompiledRules(validate_rules({}), "config_moderation.py")
+        self._reload_lock = asyncio.Lock()
+        # Quotas journaliers rangés par jour (écrits en différé, hors de la boucle)
+        self._store = JsonStateStore(AUTO_RESPONSE_STATE_FILE, lambda: self._quota.to_state(), label="AutoModeration")
+        self._quota = DailyQuota.from_state(self._store.load(default={}))
+        # Anti-flood : compteurs à fenêtre glissante par membre et par salon
+        self._user_flood = SlidingWindowCounter(MOD_FLOOD_USER_LIMIT, MOD_FLOOD_USER_WINDOW)
+        self._channel_flood = SlidingWindowCounter(MOD_RAID_CHANNEL_LIMIT, MOD_RAID_CHANNEL_WINDOW)
+        # channel_id -> fin du mode raid (self.clock)
+        self._raid_until = {}
+        # channel_id -> messages en attente de suppression groupée / auteurs à avertir
+        self._pending_deletes = {}
+        self._pending_warnings = {}
+        self._flush_tasks = set()
+        # channel_id -> dernier avertissement envoyé (self.clock)
+        self._last_warning = {}
+        # Horloge des fenêtres anti-flood (remplaçable pour rejouer un historique)
+        self.clock = time.monotonic
+        # Métriques par règle et trace échantillonnée des décisions (/modstats, /modtrace)
+        self.metrics = Metrics()
+        self.trace = DecisionTrace(MOD_TRACE_SIZE, MOD_TRACE_SAMPLE_RATE)
+
+    async def cog_load(self):
+        await ensure_role_cache(self.bot)
+        # Tous les salons sauf les tickets
+        pipeline.register("auto_moderation", self.handle_message, unless=(TICKET,))
+        self.flush_state.start()
+
+    async def cog_unload(self):
+        pipeline.unregister("auto_moderation")
+        self.flush_state.cancel()
+        # Dernière écriture à l'arrêt
+        await self._store.flush()
+
+    @tasks.loop(seconds=AUTO_RESPONSE_FLUSH_SECONDS)
+    async def flush_state(self):
+        # Évince aussi les jours passés quand personne n'a écrit depuis minuit
+        if self._quota.evict():
+            self._store.mark_dirty()
+        await self._store.flush()
+        # Oubli des compteurs et modes raid expirés
+        now = self.clock()
+        self._user_flood.prune(now)
+        self._channel_flood.prune(now)
+        for channel_id in [c for c, until in self._raid_until.items() if until <= now]:
+            del self._raid_until[channel_id]
+
+    def _author_has_monitored_role(self, member: discord.Member, rules: CompiledRules) -> bool:
+        return not rules.role_ids.isdisjoint(member_roles.role_ids(member))
 
-    def _author_in_group_targets(self, member: discord.Member, target_ids) -> bool:
+    def _author_in_group_targets(self, member: discord.Member, target_ids: frozenset) -> bool:
         if not target_ids:
             return True
-        try:
-            author_roles = {r.id for r in member.roles}
-            return any(rid in author_roles for rid in target_ids)
-        except Exception:
-            return False
+        return not target_ids.isdisjoint(member_roles.role_ids(member))
 
-    def _load_state(self):
-        try:
-            folder = os.path.dirname(self._state_file)
-            if folder and not os.path.exists(folder):
-                os.makedirs(folder, exist_ok=True)
-            if not os.path.exists(self._state_file):
-                return {}
-            with open(self._state_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-
-    def _save_state(self):
+    @staticmethod
+    def _link_text(message: discord.Message, content: str) -> str:
+        urls = [embed.url for embed in message.embeds if embed.url]
+        return "\n".join([content, *urls]) if urls else content
+
+    def _violation(self, message: discord.Message, content: str, matches: set, rules: CompiledRules):
+        """Première règle enfreinte par le message et le détail de la correspondance, ou (None, None)."""
+        checks = (
+            # Mentions (users / roles / everyone)
+            ("mentions", lambda: rules.block_mentions and (
+                len(message.mentions) + len(message.raw_role_mentions) + message.mention_everyone
+            )),
+            # Liens (texte et aperçus, y compris liens markdown et domaines nus)
+            ("links", lambda: rules.link_policy.blocked_hosts(self._link_text(message, content))),
+            # Mots interdits
+            ("banned_words", lambda: sorted(word for kind, word in matches if kind == "banned")),
+        )
+        for rule, check in checks:
+            start = time.perf_counter()
+            detail = check()
+            self.metrics.observe(rule, time.perf_counter() - start, detail)
+            if detail:
+                return rule, detail
+        return None, None
+
+    def _in_raid_mode(self, channel_id: int, now: float) -> bool:
+        return self._raid_until.get(channel_id, 0) > now
+
+    async def reload_rules(self) -> CompiledRules:
+        """Relit et compile les règles hors de la boucle, puis les remplace d'un bloc.
+
+        En cas d'erreur (fichier illisible, règle invalide), l'exception est
+        propagée et les règles en place restent actives.
+        """
+        async with self._reload_lock:
+            rules = await asyncio.to_thread(load_rules, MOD_RULES_FILE)
+            self.rules = rules
+        print(f"[AutoModeration] Règles rechargées depuis {rules.source}")
+        return rules
+
+    @app_commands.command(name="reloadmoderation", description="Reload auto-moderation rules from the rules file (admin only)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def reloadmoderation(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
         try:
-            with open(self._state_file, "w", encoding="utf-8") as f:
-                json.dump(self._state, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if not message.guild:
-            return
-        if message.author.bot:
+            rules = await self.reload_rules()
+        except Exception as e:
+            await interaction.followup.send(f"❌ Rules not reloaded, previous rules kept: {e}", ephemeral=True)
             return
+        await interaction.followup.send(
+            f"✅ Rules reloaded from `{rules.source}`: {len(rules.matcher)} patterns, "
+            f"{len(rules.groups)} auto-response groups, {len(rules.role_ids)} monitored roles.",
+            ephemeral=True,
+        )
 
-        # ⚡ Ignorer les channels de tickets
-        if isinstance(message.channel, discord.TextChannel) and message.channel.name.startswith("ticket-"):
+    async def _warn(self, channel, authors, warning_message: str):
+        """Avertissement unique pour un ou plusieurs auteurs, au plus un par salon et par fenêtre."""
+        now = self.clock()
+        if now - self._last_warning.get(channel.id, float("-inf")) < MOD_WARNING_WINDOW:
+            self.metrics.inc("warnings_throttled")
             return
+        self._last_warning[channel.id] = now
+        mentions = " ".join(dict.fromkeys(a.mention for a in authors))
+        try:
+            await channel.send(f"{mentions} {warning_message}", delete_after=5)
+            self.metrics.inc("warnings_sent")
+        except discord.HTTPException as e:
+            self.metrics.inc("warning_failed")
+            print(f"[AutoModeration] Avertissement impossible dans #{channel.id}: {e}")
 
-        content = message.content or ""
-
-        # --- Modération (s'applique uniquement si l'auteur a un rôle surveillé) ---
-        if self._author_has_monitored_role(message.author):
-            # Mentions (users / roles / everyone)
-            if MOD_BLOCK_MENTIONS:
-                if message.mentions or message.raw_role_mentions or message.mention_everyone:
-                    try:
-                        await message.delete()
-                    except Exception:
-                        pass
-                    try:
-                        await message.channel.send(f"{message.author.mention} {MOD_WARNING_MESSAGE}", delete_after=5)
-                    except Exception:
-                        pass
-                    return
-
-            # Liens
-            if MOD_BLOCK_LINKS and self.link_regex.search(content):
-                try:
-                    await message.delete()
-                except Exception:
-                    pass
-                try:
-                    await message.channel.send(f"{message.author.mention} {MOD_WARNING_MESSAGE}", delete_after=5)
-                except Exception:
-                    pass
-                return
+    async def _flush_deletes(self, channel, warning_message: str):
+        await asyncio.sleep(MOD_BULK_DELETE_DELAY)
+        messages = self._pending_deletes.pop(channel.id, [])
+        authors = self._pending_warnings.pop(channel.id, [])
+        # Suppression groupée : une requête pour 100 messages au maximum
+        for start in range(0, len(messages), 100):
+            batch = messages[start:start + 100]
+            try:
+                await channel.delete_messages(batch)
+                self.metrics.inc("bulk_deleted", len(batch))
+            except discord.HTTPException as e:
+                self.metrics.inc("bulk_delete_failed", len(batch))
+                print(f"[AutoModeration] Suppression groupée impossible dans #{channel.id}: {e}")
+        if authors:
+            await self._warn(channel, authors, warning_message)
 
-            # Mots interdits
-            text_lower = content.lower()
-            for banned in MOD_BANNED_WORDS:
-                if banned and banned.lower() in text_lower:
-                    try:
-                        await message.delete()
-                    except Exception:
-                        pass
-                    try:
-                        await message.channel.send(f"{message.author.mention} {MOD_WARNING_MESSAGE}", delete_after=5)
-                    except Exception:
-                        pass
-                    return
+    async def _punish(self, message: discord.Message, rules: CompiledRules) -> str:
+        """Supprime un message en infraction et avertit son auteur ; retourne l'action effectuée."""
+        channel = message.channel
+        if self._in_raid_mode(channel.id, self.clock()):
+            # Mode raid : mise en lot, un seul appel de suppression et un seul avertissement
+            pending = self._pending_deletes.get(channel.id)
+            if pending is None:
+                pending = self._pending_deletes[channel.id] = []
+                self._pending_warnings[channel.id] = []
+                task = asyncio.create_task(self._flush_deletes(channel, rules.warning_message))
+                self._flush_tasks.add(task)
+                task.add_done_callback(self._flush_tasks.discard)
+            pending.append(message)
+            self._pending_warnings[channel.id].append(message.author)
+            return "queued"
+        try:
+            await message.delete()
+            self.metrics.inc("deleted")
+            action = "deleted"
+        except discord.HTTPException as e:
+            self.metrics.inc("delete_failed")
+            print(f"[AutoModeration] Suppression impossible du message {message.id}: {e}")
+            action = "delete_failed"
+        await self._warn(channel, [message.author], rules.warning_message)
+        return action
 
-        # --- Réponses automatiques par groupes ---
-        if not AUTO_RESPONSE_GROUPS:
-            return
+    def _pick_response(self, message: discord.Message, matches: set, rules: CompiledRules):
+        """Premier groupe déclenché qui doit répondre à ce message : (groupe, réponse) ou (None, None)."""
+        for group_name, cfg in rules.groups.items():
+            # Groupe non déclenché par ce message
+            if ("group", group_name) not in matches:
+                continue
 
-        for group_name, cfg in AUTO_RESPONSE_GROUPS.items():
-            triggers = cfg.get("triggers", [] )
+            start = time.perf_counter()
             responses = cfg.get("responses", [] )
-            target_role_ids = cfg.get("target_role_ids", [])
-            case_sensitive = cfg.get("case_sensitive", False)
+            target_role_ids = rules.group_targets[group_name]
             daily_limit = cfg.get("daily_limit", 1) or 1
-
-            # Vérifier cible de rôle pour ce groupe
+            uid = str(message.author.id)
+            # Cible de rôle, puis quota quotidien pour (group, user)
             if not self._author_in_group_targets(message.author, target_role_ids):
+                skipped = "not_target"
+            elif not self._quota.allowed(group_name, uid, daily_limit):
+                skipped = "quota_reached"
+            elif not responses:
+                skipped = "no_responses"
+            else:
+                skipped = None
+            self.metrics.observe(f"group:{group_name}", time.perf_counter() - start, not skipped)
+            if skipped:
+                self.metrics.inc(f"group:{group_name}:{skipped}")
                 continue
 
-            check_text = content if case_sensitive else content.lower()
+            # Réponse aléatoire
+            return group_name, random.choice(responses).replace("{user}", message.author.mention)
+        return None, None
 
-            matched = False
-            for trig in triggers:
-                if not trig:
-                    continue
-                t = trig if case_sensitive else trig.lower()
-                if t in check_text:
-                    matched = True
-                    break
+    async def handle_message(self, message: discord.Message):
+        # Bots, messages privés et tickets sont filtrés par le pipeline de messages
+        # Instantané courant : un rechargement concurrent ne change pas les règles en cours de traitement
+        rules = self.rules
+        started = time.perf_counter()
+        self.metrics.inc("messages")
+        content = message.content or ""
+        # Un seul passage sur le texte pour toutes les règles
+        matches = rules.matcher.find(content) if content else set()
+        self.metrics.observe("matcher", time.perf_counter() - started, matches)
 
-            if not matched:
-                continue
+        rule = detail = group = response = None
+        # --- Modération (s'applique uniquement si l'auteur a un rôle surveillé) ---
+        if self._author_has_monitored_role(message.author, rules):
+            start = time.perf_counter()
+            now = self.clock()
+            # Rafale dans le salon : passage en mode raid
+            if self._channel_flood.hit(message.channel.id, now) and not self._in_raid_mode(message.channel.id, now):
+                print(f"[AutoModeration] Mode raid activé dans #{getattr(message.channel, 'name', message.channel.id)}")
+                self.metrics.inc("raid_mode")
+                self._raid_until[message.channel.id] = now + MOD_RAID_DURATION
+            flooding = self._user_flood.hit((message.channel.id, message.author.id), now)
+            flood_elapsed = time.perf_counter() - start
 
-            # Vérifier quota quotidien pour (group, user)
-            uid = str(message.author.id)
-            today = date.today().isoformat()
-            group_state = self._state.get(group_name, {})
-            last = group_state.get(uid)
-            if last == today:
-                # déjà répondu aujourd'hui pour ce groupe
-                continue
+            rule, detail = self._violation(message, content, matches, rules)
+            if rule is None:
+                # Trop de messages en trop peu de temps
+                self.metrics.observe("flood", flood_elapsed, flooding)
+                if flooding:
+                    rule, detail = "flood", True
 
-            # Envoyer une réponse aléatoire
-            if not responses:
-                continue
-            resp = random.choice(responses)
-            formatted = resp.replace("{user}", message.author.mention)
-            try:
-                await message.channel.send(formatted)
-            except Exception:
-                pass
+        # --- Réponses automatiques par groupes ---
+        if rule is None and rules.groups:
+            group, response = self._pick_response(message, matches, rules)
+        elapsed = time.perf_counter() - started
 
+        action = None
+        if rule is not None:
+            action = await self._punish(message, rules)
+        elif group is not None:
+            try:
+                await message.channel.send(response)
+                self.metrics.inc("responses_sent")
+                action = "responded"
+            except discord.HTTPException as e:
+                self.metrics.inc("response_failed")
+                print(f"[AutoModeration] Réponse automatique impossible ({group}): {e}")
+                action = "response_failed"
             # Mettre à jour l'état
-            if group_name not in self._state:
-                self._state[group_name] = {}
-            self._state[group_name][uid] = today
-            self._save_state()
+            self._quota.hit(group, str(message.author.id))
+            self._store.mark_dirty()
+
+        if self.trace.wants(action is not None):
+            self.trace.add(
+                message_id=message.id,
+                channel_id=message.channel.id,
+                author_id=message.author.id,
+                content=content[:MOD_TRACE_CONTENT_CHARS],
+                matches=sorted(f"{kind}:{value}" for kind, value in matches),
+                rule=rule or (group and f"group:{group}"),
+                detail=detail,
+                action=action,
+                elapsed_us=elapsed * 1e6,
+            )
+
+    @app_commands.command(name="modstats", description="Show auto-moderation rule metrics (admin only)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def modstats(self, interaction: discord.Interaction):
+        snapshot = self.metrics.snapshot()
+        lines = []
+        for name, stats in sorted(snapshot["rules"].items()):
+            lines.append(
+                f"`{name}` — {stats['hits']}/{stats['evaluations']} hits, "
+                f"p50 ≤{stats['p50_us']:.0f} µs, p95 ≤{stats['p95_us']:.0f} µs, max {stats['max_us']:.0f} µs"
+            )
+        counters = ", ".join(f"{name}: {count}" for name, count in sorted(snapshot["counters"].items()))
+        text = "📊 Auto-moderation\n" + "\n".join(lines) + f"\n\n{counters or 'no activity yet'}"
+        await interaction.response.send_message(text[:2000], ephemeral=True)
+
+    @app_commands.command(name="modtrace", description="Show the latest sampled auto-moderation decisions (admin only)")
+    @app_commands.describe(limit="Number of entries (1-20)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def modtrace(self, interaction: discord.Interaction, limit: app_commands.Range[int, 1, 20] = 10):
+        entries = self.trace.recent(limit)
+        if not entries:
+            await interaction.response.send_message("No decision traced yet.", ephemeral=True)
             return
+        lines = []
+        for entry in entries:
+            lines.append(
+                f"<t:{int(entry['at'])}:T> <#{entry['channel_id']}> <@{entry['author_id']}> "
+                f"→ **{entry['rule'] or 'none'}** {entry['detail'] or ''} [{entry['action'] or 'no action'}] "
+                f"{entry['elapsed_us']:.0f} µs — `{entry['content'][:60]}`"
+            )
+        await interaction.response.send_message("\n".join(lines)[:2000], ephemeral=True)
 
 
 async def setup(bot: commands.Bot):
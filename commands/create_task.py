@@ -1,50 +1,105 @@
+from datetime import datetime, timezone
+
 import discord
-from discord.ui import Select, View
+from discord.ui import Select
 from discord import app_commands
 import config
+from commands.task_index import get_task_index
+from commands.task_reminders import DEFAULT_REMINDERS, DUE_FIELD, get_task_reminders, parse_due, parse_offsets
+from utils.views import AuthorView
+
+TASK_STATUSES = ["To Do", "In Progress", "Done"]
 
-@discord.app_commands.command(name="createtask", description="Create a new task (Admins only)")
-@app_commands.describe(title="Title of the task", description="Task details")
-async def create_task(interaction: discord.Interaction, title: str, description: str):
-    await interaction.response.defer(ephemeral=True)
 
-    # Création des options de sélection pour la catégorie
-    category_options = [discord.SelectOption(label=key, value=key) for key in config.TASKS_CHANNEL_ID.keys()]
-    category_select = Select(placeholder="Choose a category...", options=category_options, custom_id="category_select")
+def build_task_embed(title: str, description: str, assignee: str = "None", status: str = "To Do", due=None) -> discord.Embed:
+    """Création du message embed pour une tâche (format lu par commands/task_index.py)."""
+    embed = discord.Embed(title=f"{title}", description=description, color=0xF4E3C7)
+    embed.set_thumbnail(url="https://example.com/image.png")
+    embed.add_field(name="👤 Assigned to", value=assignee, inline=True)
+    embed.add_field(name="🔄️ Status", value=status, inline=True)
+    if due is not None:
+        embed.add_field(name=DUE_FIELD, value=f"<t:{int(due.timestamp())}:F>", inline=True)
+    return embed
 
-    # Création de la vue et ajout du sélecteur de catégorie
-    view = View()
-    view.add_item(category_select)
 
-    await interaction.followup.send(f"📝 Please choose a category for the task **{title}**:", view=view, ephemeral=True)
+class CategorySelect(Select):
+    def __init__(self, title: str, description: str, due=None, offsets=()):
+        # Création des options de sélection pour la catégorie
+        options = [discord.SelectOption(label=key, value=key) for key in config.TASKS_CHANNEL_ID.keys()]
+        super().__init__(placeholder="Choose a category...", options=options)
+        self.task_title = title
+        self.task_description = description
+        self.task_due = due
+        self.task_offsets = offsets
 
-    def check(inter: discord.Interaction):
-        return inter.user == interaction.user
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        self.view.stop()
+        category = self.values[0]
 
-    # Attente de la sélection de la catégorie par l'utilisateur
-    select = await interaction.client.wait_for("interaction", check=check)
-    category = select.data['values'][0]
+        # Récupération du channel associé à la catégorie
+        channel_id = config.TASKS_CHANNEL_ID.get(category)
+        if not channel_id:
+            await interaction.edit_original_response(content="❌ Invalid category selected.", view=None)
+            return
 
-    # Récupération du channel associé à la catégorie
-    channel_id = config.TASKS_CHANNEL_ID.get(category)
-    if not channel_id:
-        await interaction.followup.send("❌ Invalid category selected.", ephemeral=True)
-        return
+        # Récupération du canal
+        channel = interaction.client.get_channel(channel_id)
+        if channel is None:
+            await interaction.edit_original_response(content="❌ The selected channel is not available.", view=None)
+            return
+
+        embed = build_task_embed(self.task_title, self.task_description, due=self.task_due)
+        # Envoi du message dans le canal
+        message = await channel.send(embed=embed)
+        # Enregistrement immédiat dans l'index des tâches
+        index = get_task_index(interaction.client)
+        if index is not None:
+            index.record_message(message)
 
-    # Récupération du canal
-    channel = interaction.client.get_channel(channel_id)
-    if channel is None:
-        await interaction.followup.send("❌ The selected channel is not available.", ephemeral=True)
+        content = f"✅ Task **{self.task_title}** created in {channel.mention}."
+        # Planification des rappels sur le planificateur partagé
+        if self.task_due is not None:
+            reminders = get_task_reminders(interaction.client)
+            if reminders is not None:
+                count = reminders.schedule(message, self.task_title, self.task_due, self.task_offsets)
+                content += f" ⏰ {count} reminder(s) scheduled."
+            else:
+                content += " ⚠️ Reminders are not available."
+        await interaction.edit_original_response(content=content, view=None)
+
+
+@discord.app_commands.command(name="createtask", description="Create a new task (Admins only)")
+@app_commands.describe(
+    title="Title of the task",
+    description="Task details",
+    due="Due date in UTC: YYYY-MM-DD or YYYY-MM-DD HH:MM",
+    reminders=f"Reminders before the due date, e.g. 1d, 2h, 30m (default: {DEFAULT_REMINDERS})",
+)
+async def create_task(interaction: discord.Interaction, title: str, description: str, due: str = None, reminders: str = None):
+    await interaction.response.defer(ephemeral=True)
+
+    due_date = None
+    offsets = ()
+    if due:
+        try:
+            due_date = parse_due(due)
+            offsets = parse_offsets(reminders or DEFAULT_REMINDERS)
+        except ValueError as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+        if due_date <= datetime.now(timezone.utc):
+            await interaction.followup.send("❌ The due date is already past.", ephemeral=True)
+            return
+    elif reminders:
+        await interaction.followup.send("❌ Reminders need a due date.", ephemeral=True)
         return
 
-    # Création du message embed pour la tâche
-    embed = discord.Embed(title=f"{title}", description=description, color=0xF4E3C7)
-    embed.set_thumbnail(url="https://example.com/image.png")
-    embed.add_field(name="👤 Assigned to", value="None", inline=True)
-    embed.add_field(name="🔄️ Status", value="To Do", inline=True)
-    # Envoi du message dans le canal
-    message = await channel.send(embed=embed)
-    await interaction.followup.send(f"✅ Task **{title}** created in {channel.mention} with card **{card_name}**.", ephemeral=True)
+    # Vue à callbacks : expire au bout de 2 minutes, sans waiter global
+    view = AuthorView(interaction.user, timeout_message="❌ Timeout: You didn't choose a category in time.")
+    view.add_item(CategorySelect(title, description, due_date, offsets))
+
+    view.message = await interaction.followup.send(f"📝 Please choose a category for the task **{title}**:", view=view, ephemeral=True, wait=True)
 
 # Fonction setup obligatoire pour chaque extension
 async def setup(bot):
@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands
+from utils.message_pipeline import TICKET, pipeline
 
 # IDs des rôles utilisés comme trigger (pas pour attribution)
 ROLE_IDS = {
@@ -18,16 +19,15 @@ class TicketOnboarding(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # Ignore bots et messages hors serveur
-        if message.author.bot or not message.guild:
-            return
+    async def cog_load(self):
+        # Uniquement les channels de tickets (nom commence par 'ticket-')
+        pipeline.register("ticket_onboarding", self.handle_message, when=(TICKET,))
 
-        # Détecte les channels de tickets (nom commence par 'ticket-')
-        if not message.channel.name.startswith("ticket-"):
-            return
+    async def cog_unload(self):
+        pipeline.unregister("ticket_onboarding")
 
+    async def handle_message(self, message: discord.Message):
+        # Bots, messages hors serveur et salons hors tickets sont filtrés par le pipeline de messages
         user_id = message.author.id
 
         # Ne pas relancer l'onboarding si déjà déclenché
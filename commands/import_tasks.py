@@ -0,0 +1,121 @@
+import io
+import csv
+import json
+import time
+
+import discord
+from discord import app_commands
+import config
+from commands.create_task import TASK_STATUSES, build_task_embed
+from commands.task_index import get_task_index
+from utils.send_queue import ChannelSendQueue
+
+# Colonnes attendues dans le fichier importé
+IMPORT_FIELDS = ("title", "description", "category", "assignee", "status")
+MAX_IMPORT_BYTES = 1_000_000
+MAX_IMPORT_ROWS = 500
+
+
+def parse_rows(filename: str, data: bytes):
+    """Lit un fichier CSV (avec en-tête) ou JSON (liste d'objets) en liste de dictionnaires."""
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        rows = json.loads(text)
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise ValueError("JSON must be a list of objects")
+        return rows
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def validate_row(row: dict):
+    """Normalise une ligne ; lève ValueError avec la raison si elle est invalide."""
+    task = {key: str(row.get(key) or "").strip() for key in IMPORT_FIELDS}
+    if not task["title"]:
+        raise ValueError("missing title")
+    if len(task["title"]) > 256:
+        raise ValueError("title longer than 256 characters")
+    if task["category"] not in config.TASKS_CHANNEL_ID:
+        raise ValueError(f"unknown category '{task['category']}'")
+    task["status"] = task["status"] or "To Do"
+    if task["status"] not in TASK_STATUSES:
+        raise ValueError(f"unknown status '{task['status']}'")
+    task["assignee"] = task["assignee"] or "None"
+    return task
+
+
+@discord.app_commands.command(name="importtasks", description="Create tasks in bulk from a CSV or JSON file (Admins only)")
+@app_commands.describe(file="CSV or JSON file with title, description, category, assignee, status")
+@app_commands.checks.has_permissions(administrator=True)
+async def import_tasks(interaction: discord.Interaction, file: discord.Attachment):
+    await interaction.response.defer(ephemeral=True)
+
+    if file.size > MAX_IMPORT_BYTES:
+        await interaction.followup.send("❌ File is too large.", ephemeral=True)
+        return
+    try:
+        rows = parse_rows(file.filename, await file.read())
+    except Exception as e:
+        await interaction.followup.send(f"❌ Could not read the file: {e}", ephemeral=True)
+        return
+    if not rows:
+        await interaction.followup.send("❌ The file contains no tasks.", ephemeral=True)
+        return
+    if len(rows) > MAX_IMPORT_ROWS:
+        await interaction.followup.send(f"❌ Too many rows ({len(rows)} > {MAX_IMPORT_ROWS}).", ephemeral=True)
+        return
+
+    index = get_task_index(interaction.client)
+    # Numéro de ligne (à partir de 1) -> raison de l'échec
+    failed = {}
+    # Titre -> première ligne qui l'utilise : une tâche doit rester joignable par son titre
+    seen_titles = {}
+    queue = ChannelSendQueue()
+    pending = []
+    start = time.perf_counter()
+    try:
+        for number, row in enumerate(rows, start=1):
+            try:
+                task = validate_row(row)
+            except ValueError as e:
+                failed[number] = str(e)
+                continue
+            if task["title"] in seen_titles:
+                failed[number] = f"duplicate title (same as row {seen_titles[task['title']]})"
+                continue
+            if index is not None and index.get(task["title"]) is not None:
+                failed[number] = "a task with this title already exists"
+                continue
+            seen_titles[task["title"]] = number
+            channel = interaction.client.get_channel(config.TASKS_CHANNEL_ID[task["category"]])
+            if channel is None:
+                failed[number] = f"channel for '{task['category']}' is not available"
+                continue
+            embed = build_task_embed(task["title"], task["description"], task["assignee"], task["status"])
+            pending.append((number, await queue.submit(channel, embed=embed)))
+    finally:
+        await queue.close()
+    elapsed = time.perf_counter() - start
+
+    created = 0
+    for number, future in pending:
+        if future.exception() is not None:
+            failed[number] = str(future.exception())
+            continue
+        created += 1
+        if index is not None:
+            index.record_message(future.result(), save=False)
+    if index is not None:
+        index.save()
+
+    rate = created / elapsed if elapsed > 0 else 0.0
+    report = f"✅ Imported **{created}/{len(rows)}** tasks in {elapsed:.1f}s ({rate:.1f} tasks/s)."
+    if failed:
+        lines = [f"• row {number}: {reason}" for number, reason in sorted(failed.items())]
+        report += "\n❌ Failed rows:\n" + "\n".join(lines)
+    if len(report) > 2000:
+        report = report[:1997] + "..."
+    await interaction.followup.send(report, ephemeral=True)
+
+# Fonction setup obligatoire pour chaque extension
+async def setup(bot):
+    bot.tree.add_command(import_tasks)
@@ -0,0 +1,65 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from utils.message_pipeline import pipeline
+
+
+class MessageRouter(commands.Cog):
+    """Unique listener on_message du bot : délègue au pipeline partagé.
+
+    Les cogs enregistrent leurs handlers dans `utils.message_pipeline.pipeline`
+    (dans cog_load) au lieu d'écouter on_message chacun de leur côté.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        await pipeline.dispatch(message)
+
+    @staticmethod
+    def _invalidate(channel):
+        # Les fils héritent de la catégorie de leur salon parent, et les salons
+        # d'une catégorie renommée changent aussi de classification
+        pipeline.invalidate_channel(channel.id)
+        for thread in getattr(channel, "threads", ()):
+            pipeline.invalidate_channel(thread.id)
+        if isinstance(channel, discord.CategoryChannel):
+            for child in channel.channels:
+                MessageRouter._invalidate(child)
+
+    # Un salon renommé ou déplacé change de classification
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self._invalidate(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self._invalidate(channel)
+
+    @commands.Cog.listener()
+    async def on_thread_update(self, before, after):
+        pipeline.invalidate_channel(after.id)
+
+    @commands.Cog.listener()
+    async def on_thread_delete(self, thread):
+        pipeline.invalidate_channel(thread.id)
+
+    @app_commands.command(name="messagestats", description="Show per-handler message processing times (admin only)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def messagestats(self, interaction: discord.Interaction):
+        lines = [
+            f"`classification` — {pipeline.classify_stats.calls} msgs, "
+            f"avg {pipeline.classify_stats.average * 1e6:.0f} µs, max {pipeline.classify_stats.max * 1e6:.0f} µs"
+        ]
+        for name, stats in sorted(pipeline.stats.items()):
+            lines.append(
+                f"`{name}` — {stats.calls} msgs, avg {stats.average * 1e6:.0f} µs, "
+                f"max {stats.max * 1e6:.0f} µs, {stats.errors} errors"
+            )
+        await interaction.response.send_message("📊 Message pipeline\n" + "\n".join(lines), ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MessageRouter(bot))
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
-
-TICKET_CATEGORY_NAME = "Public"
+from utils.role_cache import ensure_role_cache, member_roles
+from utils.message_pipeline import PUBLIC, pipeline
 
 # Liste des rôles qui déclenchent la réaction
 ROLE_NAMES_FOR_REACTION = [
@@ -17,25 +17,26 @@ class RoleReactionListener(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # Ignore les bots ou messages vides
-        if message.author.bot:
-            return
+    async def cog_load(self):
+        await ensure_role_cache(self.bot)
+        # Uniquement les salons de la catégorie "Public" (tickets)
+        pipeline.register("role_reaction", self.handle_message, when=(PUBLIC,))
 
-        # Vérifie si le message est dans la catégorie "Tickets"
-        if message.channel.category and message.channel.category.name == TICKET_CATEGORY_NAME:
+    async def cog_unload(self):
+        pipeline.unregister("role_reaction")
 
-            # Récupère les noms de roles du membre
-            user_roles = [role.name for role in message.author.roles]
+    async def handle_message(self, message: discord.Message):
+        # Bots et salons hors catégorie "Public" sont filtrés par le pipeline de messages
 
-            # Check si AU MOINS un des rôles correspond
-            if any(role in user_roles for role in ROLE_NAMES_FOR_REACTION):
-                try:
-                    await message.add_reaction(EMOJI_REACTION)
-                except Exception as e:
-                    print(f"[RoleReactionListener] Impossible d’ajouter la réaction : {e}")
+        # IDs des rôles déclencheurs (résolus une fois par serveur) et rôles du membre (en cache)
+        trigger_ids = member_roles.ids_for_names(message.guild, ROLE_NAMES_FOR_REACTION)
 
+        # Check si AU MOINS un des rôles correspond
+        if not trigger_ids.isdisjoint(member_roles.role_ids(message.author)):
+            try:
+                await message.add_reaction(EMOJI_REACTION)
+            except Exception as e:
+                print(f"[RoleReactionListener] Impossible d’ajouter la réaction : {e}")
 
 async def setup(bot):
     await bot.add_cog(RoleReactionListener(bot))
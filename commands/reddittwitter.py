@@ -7,6 +7,7 @@ from discord import app_commands, ui
 from discord.ext import commands
 import aiohttp
 import asyncpraw
+from utils.http import get_http_session
 
 # ================== Config ==================
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
@@ -36,15 +37,6 @@ SUBREDDIT_FLAIRS = {
     ],
 }
 
-# ================== Reddit init ==================
-reddit = asyncpraw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    username=REDDIT_USERNAME,
-    password=REDDIT_PASSWORD,
-    user_agent=f"discord:mybot:v1.0 (by u/{REDDIT_USERNAME})",
-)
-
 # ================== Helpers ==================
 IMAGE_CT_EXT = {
     "image/jpeg": ".jpg",
@@ -60,34 +52,16 @@ async def _save_bytes(data: bytes, suffix: str) -> str:
     tmp.close()
     return tmp.name
 
-async def _head_get_content_type(session: aiohttp.ClientSession, url: str) -> str:
-    try:
-        async with session.head(url, timeout=10) as resp:
-            c = resp.headers.get("Content-Type")
-            if c:
-                return c.split(";", 1)[0].lower()
-    except Exception:
-        pass
+async def download_image(session: aiohttp.ClientSession, url: str, filename_hint: str = "") -> str:
+    # un seul GET sur la session partagée : le Content-Type vient de cette réponse
     try:
-        headers = {"Range": "bytes=0-1023"}
-        async with session.get(url, headers=headers, timeout=10) as resp:
-            c = resp.headers.get("Content-Type")
-            if c:
-                return c.split(";", 1)[0].lower()
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                return None
+            ctype = (resp.headers.get("Content-Type") or "").split(";", 1)[0].lower()
+            data = await resp.read()
     except Exception:
-        pass
-    return ""
-
-async def download_image(url: str, filename_hint: str = "") -> str:
-    async with aiohttp.ClientSession() as session:
-        ctype = await _head_get_content_type(session, url)
-        try:
-            async with session.get(url, timeout=60) as resp:
-                if resp.status != 200:
-                    return None
-                data = await resp.read()
-        except Exception:
-            return None
+        return None
     ext = IMAGE_CT_EXT.get(ctype)
     lower = url.lower()
     if not ext:
@@ -104,6 +78,19 @@ async def download_image(url: str, filename_hint: str = "") -> str:
 class RedditPoster(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.reddit = None
+
+    async def cog_load(self):
+        # Client Reddit sur la session HTTP partagée du bot. Il n'est pas fermé
+        # au déchargement : asyncpraw fermerait la session, qui appartient au bot.
+        self.reddit = asyncpraw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            username=REDDIT_USERNAME,
+            password=REDDIT_PASSWORD,
+            user_agent=f"discord:mybot:v1.0 (by u/{REDDIT_USERNAME})",
+            requestor_kwargs={"session": get_http_session(self.bot)},
+        )
 
     def clean_label(self, text: str) -> str:
         clean = text.replace("\n", " ").strip()
@@ -123,6 +110,7 @@ class RedditPoster(commands.Cog):
             return
 
         await interaction.response.defer(ephemeral=True)
+        reddit = self.reddit
         channel = self.bot.get_channel(DISCORD_CHANNEL_LIBRARY_ID)
         if not channel:
             await interaction.followup.send("❌ Library channel not found.", ephemeral=True)
@@ -313,7 +301,7 @@ class RedditPoster(commands.Cog):
                                 break
                     if image_path: break
                 if not image_path and entry.get("image_url"):
-                    tmp_path = await download_image(entry.get("image_url"), filename_hint=entry.get("filename") or "")
+                    tmp_path = await download_image(get_http_session(self.bot), entry.get("image_url"), filename_hint=entry.get("filename") or "")
                     image_path = tmp_path
                 submission = None
                 try:
@@ -1,30 +1,26 @@
 import discord
 from discord import app_commands
-import config
+from commands.task_index import ASSIGNEE_FIELD, ASSIGNEE_FIELD_INDEX, get_task_index, task_title_autocomplete
 
 @discord.app_commands.command(name="task", description="Assign yourself a task by title")
 @app_commands.describe(title="Title of the task")
+@app_commands.autocomplete(title=task_title_autocomplete)
 async def task(interaction: discord.Interaction, title: str):
-    # Parcourir tous les canaux définis dans config.TASKS_CHANNEL_ID
-    for channel_id in config.TASKS_CHANNEL_ID.values():
-        channel = interaction.client.get_channel(channel_id)
-        
-        if not channel:  # Vérification si le canal est valide
-            await interaction.response.send_message(f"❌ Channel with ID {channel_id} is not available.", ephemeral=True)
-            return
-        
-        async for message in channel.history(limit=100):
-            if message.embeds:
-                embed = message.embeds[0]
-                # Comparer le titre de la tâche avec le titre de l'embed
-                if embed.title.strip() == f"{title}":
-                    embed.set_field_at(0, name="👤 Assigned to", value=interaction.user.mention, inline=True)
-                    await message.edit(embed=embed)
-                    await interaction.response.send_message(f"✏️ {interaction.user.mention} has taken task **{title}**", ephemeral=True)
-                    return
+    # Réponse différée : la recherche peut dépasser le délai de 3 secondes
+    await interaction.response.defer(ephemeral=True)
 
-    # Si aucune tâche n'a été trouvée
-    await interaction.response.send_message("❌ Task not found.", ephemeral=True)
+    index = get_task_index(interaction.client)
+    if index is None:
+        await interaction.followup.send("❌ Task index is not available.", ephemeral=True)
+        return
+
+    # Édition sérialisée par tâche (et fusionnée avec les éditions concurrentes)
+    message = await index.update_fields(title, {ASSIGNEE_FIELD_INDEX: (ASSIGNEE_FIELD, interaction.user.mention)})
+    if message is None:
+        await interaction.followup.send("❌ Task not found.", ephemeral=True)
+        return
+
+    await interaction.followup.send(f"✏️ {interaction.user.mention} has taken task **{message.embeds[0].title}**", ephemeral=True)
 
 # Fonction setup obligatoire pour chaque extension
 async def setup(bot):
@@ -0,0 +1,449 @@
+import asyncio
+import weakref
+from collections import Counter
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+import config
+from utils.state_store import JsonStateStore
+from utils.title_search import TitleSearch
+
+# Noms des champs des embeds de tâches (voir commands/create_task.py)
+ASSIGNEE_FIELD = "👤 Assigned to"
+STATUS_FIELD = "🔄️ Status"
+ASSIGNEE_FIELD_INDEX = 0
+STATUS_FIELD_INDEX = 1
+
+# Préfixe des valeurs d'autocomplétion désignant directement un message
+# (utilisé quand le titre dépasse la limite de 100 caractères d'un choix)
+MESSAGE_REF_PREFIX = "#msg:"
+
+# Intervalle (secondes) entre deux écritures de l'index sur disque
+INDEX_FLUSH_SECONDS = 10
+
+# Taille d'une page d'historique lors du backfill (maximum autorisé par Discord)
+BACKFILL_PAGE_SIZE = 100
+
+
+def parse_task_embed(embed: discord.Embed):
+    """Extrait (titre, assigné, statut) d'un embed de tâche, ou None si ce n'en est pas un."""
+    title = (embed.title or "").strip()
+    if not title:
+        return None
+    assignee = "None"
+    status = "To Do"
+    for field in embed.fields:
+        if field.name == ASSIGNEE_FIELD:
+            assignee = field.value
+        elif field.name == STATUS_FIELD:
+            status = field.value
+    return title, assignee, status
+
+
+class TaskIndex(commands.Cog):
+    """Index persistant des tâches : message_id -> (titre, channel_id, assignee, status).
+
+    Évite de parcourir l'historique des salons de tâches à chaque commande :
+    la recherche par titre est un simple accès dictionnaire, et le message
+    est ensuite récupéré directement via son ID. Deux tâches de même titre
+    restent deux entrées (et comptent deux fois) ; la recherche par titre
+    rend la plus récente.
+
+    L'index est tenu à jour par les événements du gateway (création, édition,
+    suppression) dans les salons de tâches, et complété une seule fois par un
+    backfill paginé dont la progression est sauvegardée. À chaque démarrage,
+    les messages postés depuis le dernier message vu sont rattrapés.
+    """
+
+    def __init__(self, bot: commands.Bot, path: str = config.TASK_INDEX_FILE):
+        self.bot = bot
+        # message_id -> {"title", "channel_id", "message_id", "assignee", "status"}
+        self._entries = {}
+        # titre -> IDs des messages portant ce titre
+        self._by_title = {}
+        # Index en mémoire des titres pour l'autocomplétion
+        self.search = TitleSearch()
+        # channel_id (str) -> {"before": ID du plus ancien message parcouru, "done": bool,
+        #                      "after": ID du plus récent message vu}
+        self._backfill = {}
+        # Salons rattrapés depuis le démarrage (messages postés pendant l'arrêt du bot)
+        self._caught_up = set()
+        self._channel_ids = set(config.TASKS_CHANNEL_ID.values())
+        self._categories = {cid: name for name, cid in config.TASKS_CHANNEL_ID.items()}
+        # Compteurs maintenus de façon incrémentale à chaque changement de tâche
+        self.category_counts = Counter()  # (catégorie, statut) -> nombre
+        self.assignee_counts = Counter()  # (assigné, statut) -> nombre
+        # Éditions en attente par message : {"fields": {index: (nom, valeur)}, "future": Future}
+        self._edit_batches = {}
+        # Un verrou par message, libéré automatiquement quand plus personne ne l'attend
+        self._edit_locks = weakref.WeakValueDictionary()
+        self._store = JsonStateStore(path, lambda: {"messages": list(self._entries.values()), "backfill": self._backfill}, label="TaskIndex")
+        self._load()
+
+    async def cog_load(self):
+        # Le backfill tourne en arrière-plan pour ne pas bloquer on_ready
+        self.backfill.start()
+        self.flush_index.start()
+
+    async def cog_unload(self):
+        self.backfill.cancel()
+        self.flush_index.cancel()
+        await self._store.flush()
+
+    # ---------- Persistance ----------
+    def _load(self):
+        data = self._store.load(default={})
+        entries = data.get("messages")
+        if entries is None:
+            # Ancien format : titre -> entrée
+            entries = [dict(entry, title=title) for title, entry in (data.get("tasks") or {}).items()]
+        for entry in entries:
+            self._put(entry)
+        self._backfill = data.get("backfill") or {}
+
+    def _save(self):
+        # Écriture différée : le fichier est réécrit par la boucle flush_index
+        self._store.mark_dirty()
+
+    @tasks.loop(seconds=INDEX_FLUSH_SECONDS)
+    async def flush_index(self):
+        await self._store.flush()
+
+    def save(self):
+        """Enregistre l'index (après des mises à jour faites avec save=False)."""
+        self._save()
+
+    # ---------- Accès à l'index ----------
+    def get(self, title: str):
+        title = title.strip()
+        if title.startswith(MESSAGE_REF_PREFIX):
+            # Valeur issue de l'autocomplétion : référence directe au message
+            try:
+                return self.get_message(int(title[len(MESSAGE_REF_PREFIX):]))
+            except ValueError:
+                return None
+        # Plusieurs tâches de même titre : la plus récente
+        message_ids = self._by_title.get(title)
+        return self._entries[max(message_ids)] if message_ids else None
+
+    def get_message(self, message_id: int):
+        """Entrée du message `message_id`, même si une tâche plus récente porte le même titre."""
+        return self._entries.get(message_id)
+
+    def suggest(self, current: str, limit: int = 25):
+        """Choix d'autocomplétion pour le texte saisi."""
+        choices = []
+        for title in self.search.suggest(current, limit):
+            value = title
+            if len(title) > 100:
+                value = f"{MESSAGE_REF_PREFIX}{self.get(title)['message_id']}"
+            choices.append(app_commands.Choice(name=title[:100], value=value))
+        return choices
+
+    def upsert(self, title: str, channel_id: int, message_id: int, assignee: str = "None", status: str = "To Do", save: bool = True):
+        # Un message édité ou renommé remplace sa propre entrée, jamais celle
+        # d'une autre tâche de même titre
+        self._remove(message_id)
+        self._put({
+            "title": title.strip(),
+            "channel_id": channel_id,
+            "message_id": message_id,
+            "assignee": assignee,
+            "status": status,
+        })
+        if save:
+            self._save()
+
+    def record_embed(self, embed: discord.Embed, channel_id: int, message_id: int, save: bool = True) -> bool:
+        """Indexe un embed de tâche. Retourne True si indexé."""
+        parsed = parse_task_embed(embed)
+        if parsed is None:
+            return False
+        title, assignee, status = parsed
+        self.upsert(title, channel_id, message_id, assignee, status, save=save)
+        return True
+
+    def record_message(self, message: discord.Message, save: bool = True) -> bool:
+        """Indexe un message s'il contient un embed de tâche. Retourne True si indexé."""
+        if not message.embeds:
+            return False
+        return self.record_embed(message.embeds[0], message.channel.id, message.id, save=save)
+
+    def remove_message(self, message_id: int, save: bool = True):
+        if self._remove(message_id) and save:
+            self._save()
+
+    def _count(self, entry, delta: int):
+        for counter, key in (
+            (self.category_counts, (self.category_of(entry), entry["status"])),
+            (self.assignee_counts, (entry["assignee"], entry["status"])),
+        ):
+            counter[key] += delta
+            if counter[key] <= 0:
+                del counter[key]
+
+    def _put(self, entry):
+        self._entries[entry["message_id"]] = entry
+        message_ids = self._by_title.setdefault(entry["title"], set())
+        if not message_ids:
+            self.search.add(entry["title"])
+        message_ids.add(entry["message_id"])
+        self._count(entry, 1)
+
+    def _remove(self, message_id: int) -> bool:
+        entry = self._entries.pop(message_id, None)
+        if entry is None:
+            return False
+        message_ids = self._by_title[entry["title"]]
+        message_ids.discard(message_id)
+        if not message_ids:
+            del self._by_title[entry["title"]]
+            self.search.remove(entry["title"])
+        self._count(entry, -1)
+        return True
+
+    def category_of(self, entry) -> str:
+        return self._categories.get(entry["channel_id"], "unknown")
+
+    def snapshot(self):
+        """Liste (titre, entrée) des tâches indexées, sans appel à Discord."""
+        return [(entry["title"], entry) for entry in self._entries.values()]
+
+    def is_complete(self) -> bool:
+        """True si le backfill a couvert tout l'historique de chaque salon de tâches,
+        y compris les messages postés pendant que le bot était arrêté."""
+        return self._caught_up >= self._channel_ids and all(
+            self._backfill.get(str(cid), {}).get("done") for cid in self._channel_ids
+        )
+
+    def _seen(self, channel_id: int, message_id: int):
+        # La marque "after" n'avance qu'une fois le salon rattrapé, sinon le
+        # rattrapage repartirait d'après les messages manqués pendant l'arrêt
+        if channel_id not in self._caught_up:
+            return
+        checkpoint = self._backfill.setdefault(str(channel_id), {"before": None, "done": False, "after": None})
+        if not checkpoint.get("after") or message_id > checkpoint["after"]:
+            checkpoint["after"] = message_id
+            self._save()
+
+    # ---------- Mise à jour incrémentale via le gateway ----------
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.channel.id not in self._channel_ids:
+            return
+        self.record_message(message)
+        self._seen(message.channel.id, message.id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        if payload.channel_id not in self._channel_ids:
+            return
+        # Une édition sans champ "embeds" ne touche pas aux embeds
+        if "embeds" not in payload.data:
+            return
+        embeds = payload.data["embeds"]
+        if not embeds or not self.record_embed(discord.Embed.from_dict(embeds[0]), payload.channel_id, payload.message_id):
+            # L'embed a été retiré ou n'est plus une tâche
+            self.remove_message(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if payload.channel_id not in self._channel_ids:
+            return
+        self.remove_message(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        if payload.channel_id not in self._channel_ids:
+            return
+        for message_id in payload.message_ids:
+            self.remove_message(message_id, save=False)
+        self._save()
+
+    # ---------- Backfill paginé et reprenable ----------
+    async def _catch_up_channel(self, channel, checkpoint):
+        """Indexe les messages postés après la marque "after" (bot arrêté entre-temps)."""
+        while checkpoint.get("after"):
+            after = discord.Object(id=checkpoint["after"])
+            page = [m async for m in channel.history(limit=BACKFILL_PAGE_SIZE, after=after, oldest_first=True)]
+            for message in page:
+                self.record_message(message, save=False)
+            if page:
+                checkpoint["after"] = page[-1].id
+            self._save()
+            if len(page) < BACKFILL_PAGE_SIZE:
+                break
+        # Tâches éditées à la main pendant l'arrêt : relecture de l'historique récent
+        async for message in channel.history(limit=BACKFILL_PAGE_SIZE):
+            if not self.record_message(message, save=False):
+                self.remove_message(message.id, save=False)
+
+    async def _backfill_channel(self, channel):
+        checkpoint = self._backfill.setdefault(str(channel.id), {"before": None, "done": False, "after": None})
+        await self._catch_up_channel(channel, checkpoint)
+        while not checkpoint["done"]:
+            before = discord.Object(id=checkpoint["before"]) if checkpoint["before"] else None
+            page = [m async for m in channel.history(limit=BACKFILL_PAGE_SIZE, before=before)]
+            for message in page:
+                self.record_message(message, save=False)
+            if page:
+                checkpoint["before"] = page[-1].id
+                if not checkpoint.get("after"):
+                    checkpoint["after"] = page[0].id
+            if len(page) < BACKFILL_PAGE_SIZE:
+                checkpoint["done"] = True
+            # Sauvegarde du point de reprise après chaque page
+            self._save()
+        self._caught_up.add(channel.id)
+
+    @tasks.loop(count=1)
+    async def backfill(self):
+        for channel_id in self._channel_ids:
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            try:
+                await self._backfill_channel(channel)
+            except Exception as e:
+                print(f"[TaskIndex] Erreur de backfill pour le salon {channel_id}: {e}")
+
+    @backfill.before_loop
+    async def before_backfill(self):
+        await self.bot.wait_until_ready()
+
+    # ---------- Résolution vers un message Discord ----------
+    async def fetch_message(self, entry):
+        """Récupère le message d'une entrée via un PartialMessage (un seul appel REST)."""
+        channel = self.bot.get_channel(entry["channel_id"])
+        if channel is None:
+            return None
+        try:
+            return await channel.get_partial_message(entry["message_id"]).fetch()
+        except discord.NotFound:
+            # Le message a été supprimé : l'entrée est obsolète
+            self.remove_message(entry["message_id"])
+            return None
+
+    async def _scan_channel(self, channel, title: str):
+        async for message in channel.history(limit=100):
+            if message.embeds and (message.embeds[0].title or "").strip() == title:
+                return message
+        return None
+
+    async def _scan_channels(self, title: str):
+        """Recherche de secours dans l'historique récent, pour les tâches non indexées.
+
+        Les salons sont parcourus en parallèle ; les recherches restantes sont
+        annulées dès qu'un salon a trouvé la tâche.
+        """
+        channels = [self.bot.get_channel(cid) for cid in config.TASKS_CHANNEL_ID.values()]
+        pending = {asyncio.create_task(self._scan_channel(c, title)) for c in channels if c}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for search in done:
+                    if search.exception() is not None:
+                        print(f"[TaskIndex] Erreur de recherche de la tâche {title}: {search.exception()}")
+                    elif search.result() is not None:
+                        return search.result()
+            return None
+        finally:
+            for search in pending:
+                search.cancel()
+
+    async def resolve(self, title: str):
+        """Retourne le message de la tâche `title`, ou None si introuvable."""
+        title = title.strip()
+        entry = self.get(title)
+        if entry is None and title.startswith(MESSAGE_REF_PREFIX):
+            return None
+        if entry is not None:
+            message = await self.fetch_message(entry)
+            if message is not None:
+                return message
+
+        # Une fois le backfill et le rattrapage terminés, l'index fait foi : inutile de scanner
+        if self.is_complete():
+            return None
+
+        message = await self._scan_channels(title)
+        if message is not None:
+            self.record_message(message)
+        return message
+
+    # ---------- Édition concurrente des tâches ----------
+    async def _flush_edits(self, entry, fields):
+        # Relecture du message sous verrou : les changements s'appliquent à
+        # l'état le plus récent, aucune écriture concurrente n'est perdue
+        message = await self.fetch_message(entry)
+        if message is None or not message.embeds:
+            return None
+        embed = message.embeds[0]
+        for field_index, (name, value) in sorted(fields.items()):
+            embed.set_field_at(field_index, name=name, value=value, inline=True)
+        message = await message.edit(embed=embed)
+        self.record_message(message)
+        return message
+
+    async def update_fields(self, title: str, fields):
+        """Modifie des champs de l'embed d'une tâche ; `fields` : {index: (nom, valeur)}.
+
+        Les éditions d'une même tâche sont sérialisées par un verrou propre au
+        message, celles de tâches différentes s'exécutent en parallèle. Les
+        demandes arrivées pendant une édition sont fusionnées dans un seul
+        `message.edit`. Retourne le message édité, ou None si introuvable.
+        """
+        entry = self.get(title)
+        if entry is None:
+            message = await self.resolve(title)
+            if message is None:
+                return None
+            entry = self._entries.get(message.id)
+            if entry is None:
+                return None
+        message_id = entry["message_id"]
+
+        batch = self._edit_batches.get(message_id)
+        if batch is None:
+            batch = self._edit_batches[message_id] = {
+                "fields": {},
+                "future": asyncio.get_running_loop().create_future(),
+            }
+        batch["fields"].update(fields)
+        future = batch["future"]
+
+        lock = self._edit_locks.get(message_id)
+        if lock is None:
+            lock = self._edit_locks[message_id] = asyncio.Lock()
+        async with lock:
+            # Le lot a peut-être déjà été appliqué par un appel précédent
+            batch = self._edit_batches.pop(message_id, None)
+            if batch is not None:
+                batch_future = batch["future"]
+                try:
+                    batch_future.set_result(await self._flush_edits(entry, batch["fields"]))
+                except Exception as e:
+                    batch_future.set_exception(e)
+                finally:
+                    # Appel annulé pendant l'édition : les appels fusionnés dans
+                    # ce lot ne doivent pas attendre indéfiniment
+                    if not batch_future.done():
+                        batch_future.cancel()
+        return await future
+
+
+def get_task_index(client) -> TaskIndex:
+    return client.get_cog("TaskIndex")
+
+
+async def task_title_autocomplete(interaction: discord.Interaction, current: str):
+    index = get_task_index(interaction.client)
+    if index is None:
+        return []
+    return index.suggest(current)
+
+
+# Fonction setup obligatoire pour chaque extension
+async def setup(bot):
+    await bot.add_cog(TaskIndex(bot))
@@ -0,0 +1,152 @@
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import discord
+from discord.ext import commands
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+import config
+from commands.task_index import get_task_index
+
+DUE_FIELD = "📅 Due"
+# Rappel par défaut quand une échéance est donnée sans rappels explicites
+DEFAULT_REMINDERS = "1d"
+# Un rappel manqué (bot hors ligne) est encore envoyé s'il a moins de ce retard
+MISFIRE_GRACE_SECONDS = 6 * 3600
+
+_OFFSET_RE = re.compile(r"^(\d+)\s*([dhm])$")
+_OFFSET_UNITS = {"d": "days", "h": "hours", "m": "minutes"}
+
+# Bot courant, utilisé par les jobs (qui doivent être des fonctions de module
+# pour pouvoir être enregistrés dans le job store)
+_bot = None
+
+
+def parse_due(text: str) -> datetime:
+    """Lit une échéance « YYYY-MM-DD » ou « YYYY-MM-DD HH:MM » (UTC)."""
+    text = text.strip()
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            due = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y-%m-%d":
+            # Échéance à la fin de la journée
+            due = due.replace(hour=23, minute=59)
+        return due.replace(tzinfo=timezone.utc)
+    raise ValueError(f"invalid due date '{text}' (expected YYYY-MM-DD or YYYY-MM-DD HH:MM, UTC)")
+
+
+def parse_offsets(text: str):
+    """Lit une liste de rappels avant échéance, ex. « 1d, 2h, 30m »."""
+    offsets = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        match = _OFFSET_RE.match(part)
+        if not match:
+            raise ValueError(f"invalid reminder '{part}' (expected e.g. 1d, 2h, 30m)")
+        if int(match.group(1)) == 0:
+            # L'échéance elle-même a déjà son rappel
+            raise ValueError(f"invalid reminder '{part}' (must be greater than zero)")
+        offsets.append(timedelta(**{_OFFSET_UNITS[match.group(2)]: int(match.group(1))}))
+    return sorted(set(offsets), reverse=True)
+
+
+def format_offset(offset: timedelta) -> str:
+    minutes = int(offset.total_seconds() // 60)
+    if minutes % 1440 == 0:
+        return f"{minutes // 1440}d"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}h"
+    return f"{minutes}m"
+
+
+async def send_task_reminder(channel_id: int, message_id: int, title: str, due_ts: int, overdue: bool):
+    """Job planifié : rappelle une tâche dans son salon, sauf si elle est terminée ou supprimée.
+
+    Une tâche supprimée n'a plus d'entrée dans l'index : ses jobs restants
+    s'exécutent une fois sans effet puis disparaissent du job store.
+    """
+    if _bot is None:
+        return
+    index = get_task_index(_bot)
+    entry = index.get_message(message_id) if index is not None else None
+    if entry is None or entry["status"] == "Done":
+        return
+    channel = _bot.get_channel(channel_id)
+    if channel is None:
+        return
+    # Titre courant : la tâche a pu être renommée depuis la planification
+    title = entry["title"]
+    assignee = f"{entry['assignee']} " if entry["assignee"] != "None" else ""
+    if overdue:
+        text = f"⌛ {assignee}Task **{title}** is overdue (due <t:{due_ts}:R>)."
+    else:
+        text = f"⏰ {assignee}Task **{title}** is due <t:{due_ts}:R>."
+    try:
+        await channel.send(text, reference=channel.get_partial_message(message_id), mention_author=False)
+    except discord.HTTPException as e:
+        print(f"[TaskReminders] Impossible d'envoyer le rappel de {title}: {e}")
+
+
+class TaskReminders(commands.Cog):
+    """Échéances et rappels de tâches sur un unique planificateur partagé.
+
+    Les rappels sont des jobs APScheduler stockés en SQLite : ils survivent
+    aux redémarrages, et seul le prochain job à échéance est suivi en
+    mémoire (un seul timer, pas une coroutine endormie par tâche).
+    """
+
+    def __init__(self, bot: commands.Bot, url: str = config.TASK_REMINDERS_DB):
+        self.bot = bot
+        path = url.split("sqlite:///", 1)[-1] if url.startswith("sqlite:///") else ""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.scheduler = AsyncIOScheduler(
+            jobstores={"default": SQLAlchemyJobStore(url=url)},
+            job_defaults={"coalesce": True, "misfire_grace_time": MISFIRE_GRACE_SECONDS},
+            timezone=timezone.utc,
+        )
+
+    async def cog_load(self):
+        global _bot
+        _bot = self.bot
+        self.scheduler.start()
+
+    async def cog_unload(self):
+        global _bot
+        self.scheduler.shutdown(wait=False)
+        _bot = None
+
+    def schedule(self, message: discord.Message, title: str, due: datetime, offsets):
+        """Planifie les rappels d'une tâche ; retourne le nombre de jobs créés."""
+        now = datetime.now(timezone.utc)
+        due_ts = int(due.timestamp())
+        runs = [(due - offset, format_offset(offset), False) for offset in offsets]
+        runs.append((due, "due", True))
+        count = 0
+        for run_date, label, overdue in runs:
+            if run_date <= now:
+                continue
+            self.scheduler.add_job(
+                send_task_reminder,
+                trigger="date",
+                run_date=run_date,
+                args=[message.channel.id, message.id, title, due_ts, overdue],
+                id=f"task-{message.id}-{label}",
+                replace_existing=True,
+            )
+            count += 1
+        return count
+
+
+def get_task_reminders(client) -> TaskReminders:
+    return client.get_cog("TaskReminders")
+
+
+# Fonction setup obligatoire pour chaque extension
+async def setup(bot):
+    await bot.add_cog(TaskReminders(bot))
@@ -0,0 +1,124 @@
+import discord
+from discord import app_commands, ui
+import config
+from commands.create_task import TASK_STATUSES
+from commands.task_index import get_task_index
+from utils.views import AuthorView
+
+TASKS_PER_PAGE = 15
+TOP_ASSIGNEES = 10
+STATUS_EMOJIS = {"To Do": "📝", "In Progress": "🔨", "Done": "✅"}
+
+
+def summary_embed(index) -> discord.Embed:
+    """Résumé calculé uniquement à partir des compteurs incrémentaux de l'index."""
+    embed = discord.Embed(title="📋 Task board", color=0xF4E3C7)
+    for category in config.TASKS_CHANNEL_ID:
+        counts = [f"{STATUS_EMOJIS.get(s, '')} {s}: **{index.category_counts.get((category, s), 0)}**" for s in TASK_STATUSES]
+        embed.add_field(name=category, value="\n".join(counts), inline=True)
+
+    per_assignee = {}
+    for (assignee, status), count in index.assignee_counts.items():
+        if assignee == "None":
+            continue
+        per_assignee.setdefault(assignee, {})[status] = count
+    top = sorted(per_assignee.items(), key=lambda item: sum(item[1].values()), reverse=True)[:TOP_ASSIGNEES]
+    if top:
+        lines = [
+            f"{assignee}: " + " · ".join(f"{STATUS_EMOJIS.get(s, '')} {counts.get(s, 0)}" for s in TASK_STATUSES)
+            for assignee, counts in top
+        ]
+        embed.add_field(name="👤 Assignees", value="\n".join(lines), inline=False)
+    return embed
+
+
+class TaskBoardView(AuthorView):
+    """Pagination de la liste des tâches filtrées (instantané pris à l'appel de la commande)."""
+
+    def __init__(self, author, index, tasks, filters: str):
+        super().__init__(author, timeout=300)
+        self.index = index
+        self.tasks = tasks
+        self.filters = filters
+        self.page = 0
+        self.pages = max(1, (len(tasks) + TASKS_PER_PAGE - 1) // TASKS_PER_PAGE)
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+
+    def page_embed(self) -> discord.Embed:
+        start = self.page * TASKS_PER_PAGE
+        lines = []
+        for title, entry in self.tasks[start:start + TASKS_PER_PAGE]:
+            url = f"https://discord.com/channels/{config.GUILD_ID}/{entry['channel_id']}/{entry['message_id']}"
+            short = title if len(title) <= 80 else title[:77] + "..."
+            lines.append(f"{STATUS_EMOJIS.get(entry['status'], '•')} [{short}]({url}) — {entry['assignee']}")
+        embed = discord.Embed(
+            title=f"📋 Tasks ({len(self.tasks)}){self.filters}",
+            description="\n".join(lines) or "No task matches.",
+            color=0xF4E3C7,
+        )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages}")
+        return embed
+
+    async def _show(self, interaction: discord.Interaction):
+        self._update_buttons()
+        await interaction.response.edit_message(embeds=[summary_embed(self.index), self.page_embed()], view=self)
+
+    async def on_timeout(self):
+        # Tableau en lecture seule : il reste affiché, seuls les boutons sont désactivés
+        if self.message is None:
+            return
+        self.previous_page.disabled = True
+        self.next_page.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass
+
+    @ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: ui.Button):
+        self.page = max(0, self.page - 1)
+        await self._show(interaction)
+
+    @ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: ui.Button):
+        self.page = min(self.pages - 1, self.page + 1)
+        await self._show(interaction)
+
+
+@discord.app_commands.command(name="taskboard", description="Show tasks by category, status and assignee")
+@app_commands.describe(category="Only show this category", status="Only show this status", assignee="Only show tasks assigned to this member")
+@app_commands.choices(
+    category=[app_commands.Choice(name=key, value=key) for key in config.TASKS_CHANNEL_ID.keys()],
+    status=[app_commands.Choice(name=state, value=state) for state in TASK_STATUSES],
+)
+async def taskboard(interaction: discord.Interaction, category: str = None, status: str = None, assignee: discord.Member = None):
+    index = get_task_index(interaction.client)
+    if index is None:
+        await interaction.response.send_message("❌ Task index is not available.", ephemeral=True)
+        return
+
+    # Lecture de l'état en cache uniquement : aucune lecture d'historique
+    tasks = index.snapshot()
+    filters = []
+    if category:
+        tasks = [(t, e) for t, e in tasks if index.category_of(e) == category]
+        filters.append(category)
+    if status:
+        tasks = [(t, e) for t, e in tasks if e["status"] == status]
+        filters.append(status)
+    if assignee:
+        tasks = [(t, e) for t, e in tasks if e["assignee"] == assignee.mention]
+        filters.append(assignee.display_name)
+    tasks.sort(key=lambda item: item[1]["message_id"], reverse=True)
+
+    view = TaskBoardView(interaction.user, index, tasks, f" — {', '.join(filters)}" if filters else "")
+    await interaction.response.send_message(embeds=[summary_embed(index), view.page_embed()], view=view, ephemeral=True)
+    view.message = await interaction.original_response()
+
+# Fonction setup obligatoire pour chaque extension
+async def setup(bot):
+    bot.tree.add_command(taskboard)
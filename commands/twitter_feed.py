@@ -1,12 +1,18 @@
 import os
+import re
 import json
-import tempfile
-import aiohttp
+import time
+import asyncio
+from collections import Counter
 
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
-import tweepy
+from tweepy.asynchronous import AsyncClient
+from utils.media import download_first_fitting, download_to_spool
+from utils.http import get_http_session
+from utils.loop_lag import LoopLagMonitor
+from utils.state_store import JsonStateStore
 
 # ================== Config ==================
 BEARER_TOKEN = os.environ.get("TWITTER_BEARER_TOKEN")
@@ -14,18 +20,110 @@ TWITTER_USERNAME = os.environ.get("TWITTER_USERNAME")  # ex: "pirpg"
 DISCORD_CHANNEL_LIBRARY_ID = int(os.environ.get("DISCORD_CHANNEL_LIBRARY_ID", "1439549538556973106"))
 CHECK_INTERVAL_MINUTES = int(os.environ.get("CHECK_INTERVAL_MINUTES", "10"))
 POSTED_TWEETS_FILE = "posted_tweet_ids.json"
+FEED_STATE_FILE = "twitter_feed_state.json"  # since_id high-water mark
+BOOTSTRAP_RESULTS = 5  # first run without since_id: only the latest tweets
+PAGE_RESULTS = 100  # API maximum per page when catching up
+MAX_BACKLOG_PAGES = 32  # catch-up cap: 3200 tweets, the API's own timeline limit
+TWEET_FIELDS = ["created_at", "entities", "attachments"]
+MEDIA_FIELDS = ["url", "preview_image_url", "type", "variants"]
+TWITTER_TIMEOUT_SECONDS = 30  # per Twitter API call, so a stalled request cannot hang the poll
+THUMB_MAX_BYTES = 8 * 1024 * 1024
+
+_FOOTER_ID_RE = re.compile(r"Tweet ID:\s*(\d+)")
+_STATUS_URL_RE = re.compile(r"(?:twitter|x)\.com/\w+/status(?:es)?/(\d+)")
+_MEDIA_FILENAME_RE = re.compile(r"^(\d+)(?:_thumb)?\.\w+$")
+
+
+def extract_tweet_ids(texts, filenames) -> frozenset:
+    """Tweet ids referenced by `Tweet ID:` footers, status URLs and `{tid}.mp4` / `{tid}_thumb.jpg` files."""
+    ids = set()
+    for text in texts:
+        if text:
+            ids.update(_FOOTER_ID_RE.findall(text))
+            ids.update(_STATUS_URL_RE.findall(text))
+    for name in filenames:
+        match = _MEDIA_FILENAME_RE.match(name or "")
+        if match:
+            ids.add(match.group(1))
+    return frozenset(ids)
+
+
+def tweet_ids_in_message(msg: discord.Message) -> frozenset:
+    texts = [msg.content]
+    for emb in msg.embeds:
+        texts += [emb.footer.text, emb.description, emb.url, emb.author.url]
+    return extract_tweet_ids(texts, [att.filename for att in msg.attachments])
+
+
+def tweet_ids_in_raw_message(data: dict) -> frozenset:
+    texts = [data.get("content")]
+    for emb in data.get("embeds", []):
+        texts += [(emb.get("footer") or {}).get("text"), emb.get("description"), emb.get("url"), (emb.get("author") or {}).get("url")]
+    return extract_tweet_ids(texts, [att.get("filename") for att in data.get("attachments", [])])
+
+
+class TweetLibraryIndex:
+    """Set of tweet ids present in the library channel, kept per message so edits and deletes stay exact."""
+
+    def __init__(self):
+        self._by_message = {}
+        self._refs = Counter()
+
+    def __contains__(self, tid) -> bool:
+        return tid in self._refs
+
+    def __len__(self):
+        return len(self._refs)
+
+    def set_message(self, message_id: int, tids: frozenset):
+        self.remove_message(message_id)
+        if tids:
+            self._by_message[message_id] = tids
+            self._refs.update(tids)
+
+    def remove_message(self, message_id: int):
+        for tid in self._by_message.pop(message_id, ()):
+            self._refs[tid] -= 1
+            if not self._refs[tid]:
+                del self._refs[tid]
+
 
 # ================== Cog ==================
 class TwitterFeedListener(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.client = tweepy.Client(bearer_token=BEARER_TOKEN)
+        # async client: API calls never block the event loop (gateway, commands, moderation)
+        self.client = AsyncClient(bearer_token=BEARER_TOKEN)
+        self.loop_lag = LoopLagMonitor()
         self.user_id = None
         self.posted_tweet_ids = self.load_posted_tweets()
+        # Newest tweet id already handled; only newer tweets are requested
+        self._state = JsonStateStore(FEED_STATE_FILE, lambda: {"since_id": self.since_id}, label="TwitterFeedListener")
+        self.since_id = (self._state.load(default={}) or {}).get("since_id")
+        if self.since_id is None and self.posted_tweet_ids:
+            # Migration: resume after the newest tweet already posted
+            self.since_id = str(max(self.posted_tweet_ids, key=int))
+        # tweet ids already in the library channel, filled by scan_library
+        self.library = TweetLibraryIndex()
+        self._library_ready = asyncio.Event()
+        # one fetch-and-post cycle at a time
+        self._poll_lock = asyncio.Lock()
         self.check_tweets.start()
 
-    def cog_unload(self):
+    async def cog_load(self):
+        # bot-wide pooled session for API calls and media downloads (owned and closed by the bot)
+        self.http = get_http_session(self.bot)
+        self.client.session = self.http
+        self.loop_lag.start()
+        self.scan_library.start()
+
+    async def cog_unload(self):
         self.check_tweets.cancel()
+        self.scan_library.cancel()
+        self.loop_lag.stop()
+
+    async def twitter_call(self, coro):
+        return await asyncio.wait_for(coro, TWITTER_TIMEOUT_SECONDS)
 
     def load_posted_tweets(self):
         if os.path.exists(POSTED_TWEETS_FILE):
@@ -43,233 +141,274 @@ class TwitterFeedListener(commands.Cog):
         except Exception as e:
             print(f"[TwitterFeedListener] Error saving posted tweets: {e}")
 
-    async def tweet_in_library(self, tid: str, channel: discord.TextChannel, search_limit: int = 500) -> bool:
-        """
-        Inspect recent messages in the library channel to see if a tweet with id `tid`
-        is already present (embed footer, embed description/content, attachment filename/url, message content).
-        """
+    def tweet_in_library(self, tid) -> bool:
+        """Whether the library channel already holds tweet `tid` (O(1), see TweetLibraryIndex)."""
+        return str(tid) in self.library
+
+    # ---------- library index: startup scan + gateway updates ----------
+    @tasks.loop(count=1)
+    async def scan_library(self):
+        channel = self.bot.get_channel(DISCORD_CHANNEL_LIBRARY_ID)
         try:
-            async for msg in channel.history(limit=search_limit):
-                # check embeds (footer or description)
-                for emb in getattr(msg, "embeds", []) or []:
-                    footer = getattr(getattr(emb, "footer", None), "text", None)
-                    if footer and str(tid) in footer:
-                        return True
-                    desc = getattr(emb, "description", None)
-                    if desc and str(tid) in desc:
-                        return True
-                # check message content
-                if msg.content and str(tid) in msg.content:
-                    return True
-                # check attachments (filename or url)
-                for att in getattr(msg, "attachments", []) or []:
-                    fname = getattr(att, "filename", "") or ""
-                    url = getattr(att, "url", "") or ""
-                    proxy = getattr(att, "proxy_url", "") or ""
-                    if fname and str(tid) in fname:
-                        return True
-                    if url and str(tid) in url:
-                        return True
-                    if proxy and str(tid) in proxy:
-                        return True
+            if channel is None:
+                print(f"[TwitterFeedListener] Channel {DISCORD_CHANNEL_LIBRARY_ID} not found, library index empty.")
+                return
+            started = time.perf_counter()
+            scanned = 0
+            async for msg in channel.history(limit=None):
+                self.library.set_message(msg.id, tweet_ids_in_message(msg))
+                scanned += 1
+            print(
+                f"[TwitterFeedListener] Library indexed: {len(self.library)} tweets "
+                f"in {scanned} messages ({time.perf_counter() - started:.1f}s)"
+            )
         except Exception as e:
-            print(f"[TwitterFeedListener] Error searching library for tweet {tid}: {e}")
-        return False
+            print(f"[TwitterFeedListener] Error scanning library channel: {e}")
+        finally:
+            self._library_ready.set()
+
+    @scan_library.before_loop
+    async def before_scan_library(self):
+        await self.bot.wait_until_ready()
 
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.channel.id == DISCORD_CHANNEL_LIBRARY_ID:
+            self.library.set_message(message.id, tweet_ids_in_message(message))
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        if payload.channel_id != DISCORD_CHANNEL_LIBRARY_ID:
+            return
+        data = payload.data
+        # partial updates without content, embeds or attachments keep the current ids
+        if not any(key in data for key in ("content", "embeds", "attachments")):
+            return
+        self.library.set_message(payload.message_id, tweet_ids_in_raw_message(data))
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if payload.channel_id == DISCORD_CHANNEL_LIBRARY_ID:
+            self.library.remove_message(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        if payload.channel_id == DISCORD_CHANNEL_LIBRARY_ID:
+            for message_id in payload.message_ids:
+                self.library.remove_message(message_id)
+
+    async def fetch_new_tweets(self):
+        """Tweets newer than `since_id`, oldest first, with their media keyed by media_key.
+
+        Pages through `next_token` so a burst or downtime between polls is
+        caught up (up to MAX_BACKLOG_PAGES pages).
+        """
+        tweets, media_dict = [], {}
+        params = dict(
+            id=self.user_id,
+            tweet_fields=TWEET_FIELDS,
+            expansions=["attachments.media_keys"],
+            media_fields=MEDIA_FIELDS,
+            exclude=["replies", "retweets"],
+        )
+        if self.since_id is None:
+            # first run: same as before, only the latest tweets
+            params["max_results"] = BOOTSTRAP_RESULTS
+            pages = 1
+        else:
+            params["max_results"] = PAGE_RESULTS
+            params["since_id"] = self.since_id
+            pages = MAX_BACKLOG_PAGES
+
+        next_token = None
+        for _ in range(pages):
+            if next_token:
+                params["pagination_token"] = next_token
+            response = await self.twitter_call(self.client.get_users_tweets(**params))
+            tweets.extend(getattr(response, "data", None) or [])
+            includes = getattr(response, "includes", None) or {}
+            for m in includes.get("media", []):
+                key = m.get("media_key") if isinstance(m, dict) else getattr(m, "media_key", None)
+                if key:
+                    media_dict[key] = m
+            next_token = (getattr(response, "meta", None) or {}).get("next_token")
+            if not next_token:
+                break
+        if next_token:
+            # pages go backwards in time: what is left is older than everything fetched
+            print(f"[TwitterFeedListener] Backlog exceeds {pages * PAGE_RESULTS} tweets, older ones are skipped.")
+        tweets.sort(key=lambda t: int(t.id))
+        return tweets, media_dict
 
     async def fetch_and_post_tweets(self):
+        # the scheduled poll and /twitterfeed must not overlap (duplicate posts, since_id going back)
+        async with self._poll_lock:
+            await self._fetch_and_post_tweets()
+
+    async def _fetch_and_post_tweets(self):
+        started = time.perf_counter()
+        self.loop_lag.reset_window()
         try:
             # ensure user id
             if self.user_id is None:
-                user = self.client.get_user(username=TWITTER_USERNAME)
+                user = await self.twitter_call(self.client.get_user(username=TWITTER_USERNAME))
                 if not user or not getattr(user, "data", None):
                     print("[TwitterFeedListener] Could not fetch twitter user.")
                     return
                 self.user_id = user.data.id
 
-            # get recent tweets with media expansions
-            tweets = self.client.get_users_tweets(
-                id=self.user_id,
-                max_results=5,
-                tweet_fields=["created_at", "entities", "attachments"],
-                expansions=["attachments.media_keys"],
-                media_fields=["url", "preview_image_url", "type", "variants"],
-                exclude=["replies", "retweets"],
-            )
-
-            if not getattr(tweets, "data", None):
-                return
-
             channel = self.bot.get_channel(DISCORD_CHANNEL_LIBRARY_ID)
             if not channel:
                 print(f"[TwitterFeedListener] Channel {DISCORD_CHANNEL_LIBRARY_ID} not found.")
                 return
 
-            media_list = tweets.includes.get("media", []) if getattr(tweets, "includes", None) else []
-            # build media dict keyed by media_key
-            media_dict = {}
-            for m in media_list:
-                try:
-                    key = m.get("media_key") if isinstance(m, dict) else getattr(m, "media_key", None)
-                except Exception:
-                    key = None
-                if key:
-                    media_dict[key] = m
+            # only tweets newer than since_id, oldest first
+            tweets, media_dict = await self.fetch_new_tweets()
+            if not tweets:
+                return
+
+            # duplicate checks need the library index
+            await self._library_ready.wait()
 
-            for tweet in tweets.data:
+            for tweet in tweets:
                 tid = getattr(tweet, "id", None)
                 if not tid:
                     continue
 
-                # skip if already processed
-                if tid in self.posted_tweet_ids:
-                    continue
+                await self.post_tweet(channel, tweet, media_dict)
+                # oldest first: everything up to this tweet is handled
+                self.since_id = str(tid)
+                self._state.mark_dirty()
 
-                # skip if already present in the library channel (embed/footer/content/attachments)
-                already_in_lib = await self.tweet_in_library(tid, channel)
-                if already_in_lib:
-                    print(f"[TwitterFeedListener] Tweet {tid} already in library — skipping.")
-                    self.posted_tweet_ids.add(tid)
-                    continue
+        except asyncio.TimeoutError:
+            print(f"[TwitterFeedListener] Twitter API did not answer within {TWITTER_TIMEOUT_SECONDS}s, retrying next cycle.")
+        except Exception as e:
+            print(f"[TwitterFeedListener] Error fetching tweets: {e}")
+        finally:
+            self.save_posted_tweets()
+            await self._state.flush()
+            print(
+                f"[TwitterFeedListener] Poll finished in {time.perf_counter() - started:.1f}s, "
+                f"max event loop lag {self.loop_lag.window_max * 1000:.0f} ms"
+            )
 
-                embed = discord.Embed(
-                    description=getattr(tweet, "text", "") or "",
-                    color=discord.Color.orange(),
-                    timestamp=getattr(tweet, "created_at", None)
-                )
-                embed.set_author(
-                    name=f"Twitter - @{TWITTER_USERNAME}",
-                    url=f"https://twitter.com/{TWITTER_USERNAME}/status/{tid}"
-                )
-
-                # default values
-                video_download_url = None
-                image_url = None
-
-                attachments = getattr(tweet, "attachments", None) or {}
-                media_keys = attachments.get("media_keys", []) if isinstance(attachments, dict) else getattr(attachments, "media_keys", []) or []
-
-                for key in media_keys:
-                    m = media_dict.get(key)
-                    if not m:
-                        continue
-                    m_type = (m.get("type") if isinstance(m, dict) else getattr(m, "type", None)) or ""
-
-                    if m_type == "photo":
-                        image_url = (m.get("url") if isinstance(m, dict) else getattr(m, "url", None)) or (m.get("preview_image_url") if isinstance(m, dict) else getattr(m, "preview_image_url", None))
-                        if image_url:
-                            embed.set_image(url=image_url)
-                            break
-
-                    elif m_type in ("video", "animated_gif"):
-                        variants = (m.get("variants") if isinstance(m, dict) else getattr(m, "variants", None)) or []
-                        mp4_variants = []
-                        for v in variants:
-                            v_url = v.get("url") if isinstance(v, dict) else getattr(v, "url", None)
-                            v_ct = v.get("content_type") if isinstance(v, dict) else getattr(v, "content_type", None)
-                            v_br = v.get("bit_rate") if isinstance(v, dict) else getattr(v, "bit_rate", None)
-                            if v_url and v_ct and v_ct.startswith("video/mp4"):
-                                try:
-                                    bitrate = int(v_br) if v_br is not None else 0
-                                except Exception:
-                                    bitrate = 0
-                                mp4_variants.append((bitrate, v_url))
-                        if mp4_variants:
-                            mp4_variants.sort(reverse=True)
-                            video_download_url = mp4_variants[0][1]
-                        else:
-                            image_url = (m.get("preview_image_url") if isinstance(m, dict) else getattr(m, "preview_image_url", None))
-                            if image_url:
-                                embed.set_image(url=image_url)
-                        if video_download_url or image_url:
-                            break
-
-                    else:
-                        url = (m.get("url") if isinstance(m, dict) else getattr(m, "url", None)) or (m.get("preview_image_url") if isinstance(m, dict) else getattr(m, "preview_image_url", None))
-                        if url and not image_url:
-                            image_url = url
-                            embed.set_image(url=image_url)
-
-                embed.set_footer(text=f"Tweet ID: {tid}")
-
-                if video_download_url:
-                    try:
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get(video_download_url, timeout=60) as vresp:
-                                if vresp.status == 200:
-                                    vdata = await vresp.read()
-                                else:
-                                    await channel.send(embed=embed)
-                                    self.posted_tweet_ids.add(tid)
-                                    continue
-
-                            thumb_path = None
-                            if image_url:
-                                try:
-                                    async with session.get(image_url, timeout=30) as tresp:
-                                        if tresp.status == 200:
-                                            tdata = await tresp.read()
-                                            thumb_tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-                                            try:
-                                                thumb_tmp.write(tdata)
-                                                thumb_tmp.close()
-                                                thumb_path = thumb_tmp.name
-                                            except Exception:
-                                                try:
-                                                    os.unlink(thumb_tmp.name)
-                                                except Exception:
-                                                    pass
-                                except Exception:
-                                    thumb_path = None
-
-                            vid_tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-                            try:
-                                vid_tmp.write(vdata)
-                                vid_tmp.close()
-                                video_path = vid_tmp.name
-                            except Exception:
-                                try:
-                                    os.unlink(vid_tmp.name)
-                                except Exception:
-                                    pass
-                                await channel.send(embed=embed)
-                                self.posted_tweet_ids.add(tid)
-                                continue
-
-                            files_to_send = []
-                            if thumb_path:
-                                thumb_filename = f"{tid}_thumb.jpg"
-                                files_to_send.append(discord.File(thumb_path, filename=thumb_filename))
-                                embed.set_image(url=f"attachment://{thumb_filename}")
-
-                            video_filename = f"{tid}.mp4"
-                            files_to_send.append(discord.File(video_path, filename=video_filename))
-
-                            await channel.send(embed=embed, files=files_to_send)
-
-                            try:
-                                if thumb_path and os.path.exists(thumb_path):
-                                    os.unlink(thumb_path)
-                            except Exception:
-                                pass
-                            try:
-                                if os.path.exists(video_path):
-                                    os.unlink(video_path)
-                            except Exception:
-                                pass
-                        # end session context
-                    except Exception as e:
-                        print(f"[TwitterFeedListener] Error downloading/video attaching {video_download_url}: {e}")
-                        await channel.send(embed=embed)
+    async def post_tweet(self, channel: discord.TextChannel, tweet, media_dict):
+        tid = tweet.id
+
+        # skip if already processed
+        if tid in self.posted_tweet_ids:
+            return
+
+        # skip if already present in the library channel (embed/footer/content/attachments)
+        if self.tweet_in_library(tid):
+            print(f"[TwitterFeedListener] Tweet {tid} already in library — skipping.")
+            self.posted_tweet_ids.add(tid)
+            return
+
+        embed = discord.Embed(
+            description=getattr(tweet, "text", "") or "",
+            color=discord.Color.orange(),
+            timestamp=getattr(tweet, "created_at", None)
+        )
+        embed.set_author(
+            name=f"Twitter - @{TWITTER_USERNAME}",
+            url=f"https://twitter.com/{TWITTER_USERNAME}/status/{tid}"
+        )
+
+        # default values
+        video_download_url = None
+        video_urls = []
+        image_url = None
+
+        attachments = getattr(tweet, "attachments", None) or {}
+        media_keys = attachments.get("media_keys", []) if isinstance(attachments, dict) else getattr(attachments, "media_keys", []) or []
+
+        for key in media_keys:
+            m = media_dict.get(key)
+            if not m:
+                continue
+            m_type = (m.get("type") if isinstance(m, dict) else getattr(m, "type", None)) or ""
+
+            if m_type == "photo":
+                image_url = (m.get("url") if isinstance(m, dict) else getattr(m, "url", None)) or (m.get("preview_image_url") if isinstance(m, dict) else getattr(m, "preview_image_url", None))
+                if image_url:
+                    embed.set_image(url=image_url)
+                    break
+
+            elif m_type in ("video", "animated_gif"):
+                variants = (m.get("variants") if isinstance(m, dict) else getattr(m, "variants", None)) or []
+                mp4_variants = []
+                for v in variants:
+                    v_url = v.get("url") if isinstance(v, dict) else getattr(v, "url", None)
+                    v_ct = v.get("content_type") if isinstance(v, dict) else getattr(v, "content_type", None)
+                    v_br = v.get("bit_rate") if isinstance(v, dict) else getattr(v, "bit_rate", None)
+                    if v_url and v_ct and v_ct.startswith("video/mp4"):
+                        try:
+                            bitrate = int(v_br) if v_br is not None else 0
+                        except Exception:
+                            bitrate = 0
+                        mp4_variants.append((bitrate, v_url))
+                if mp4_variants:
+                    # highest bitrate first, lower ones as fallbacks when too large
+                    mp4_variants.sort(reverse=True)
+                    video_urls = [v_url for _, v_url in mp4_variants]
+                    video_download_url = video_urls[0]
                 else:
-                    await channel.send(embed=embed)
+                    image_url = (m.get("preview_image_url") if isinstance(m, dict) else getattr(m, "preview_image_url", None))
+                    if image_url:
+                        embed.set_image(url=image_url)
+                if video_download_url or image_url:
+                    break
 
-                self.posted_tweet_ids.add(tid)
+            else:
+                url = (m.get("url") if isinstance(m, dict) else getattr(m, "url", None)) or (m.get("preview_image_url") if isinstance(m, dict) else getattr(m, "preview_image_url", None))
+                if url and not image_url:
+                    image_url = url
+                    embed.set_image(url=image_url)
 
-            self.save_posted_tweets()
+        embed.set_footer(text=f"Tweet ID: {tid}")
 
-        except Exception as e:
-            print(f"[TwitterFeedListener] Error fetching tweets: {e}")
+        if video_download_url:
+            try:
+                await self.send_with_video(channel, embed, tid, video_urls, image_url)
+            except Exception as e:
+                print(f"[TwitterFeedListener] Error downloading/video attaching {video_download_url}: {e}")
+                await channel.send(embed=embed)
+        else:
+            await channel.send(embed=embed)
+
+        self.posted_tweet_ids.add(tid)
+
+    async def send_with_video(self, channel: discord.TextChannel, embed: discord.Embed, tid, video_urls, image_url):
+        """Attach the video (and its thumbnail) streamed to spooled temp files, within the guild upload limit."""
+        # the upload limit covers every file of the message
+        budget = channel.guild.filesize_limit
+        files_to_send, spools = [], []
+        try:
+            if image_url:
+                try:
+                    thumb = await download_to_spool(self.http, image_url, min(THUMB_MAX_BYTES, budget))
+                    spools.append(thumb)
+                    budget -= thumb.seek(0, os.SEEK_END)
+                    thumb.seek(0)
+                    thumb_filename = f"{tid}_thumb.jpg"
+                    files_to_send.append(discord.File(thumb, filename=thumb_filename))
+                    embed.set_image(url=f"attachment://{thumb_filename}")
+                except Exception as e:
+                    print(f"[TwitterFeedListener] Thumbnail skipped for tweet {tid}: {e}")
+
+            _, video = await download_first_fitting(self.http, video_urls, budget)
+            if video is None:
+                # no variant fits: the embed (with thumbnail if any) is posted alone
+                print(f"[TwitterFeedListener] No video variant of tweet {tid} fits in {budget} bytes.")
+            else:
+                spools.append(video)
+                files_to_send.append(discord.File(video, filename=f"{tid}.mp4"))
+            await channel.send(embed=embed, files=files_to_send)
+        finally:
+            # discord.File does not close buffers it did not open
+            for spool in spools:
+                spool.close()
 
     @tasks.loop(minutes=CHECK_INTERVAL_MINUTES)
     async def check_tweets(self):
@@ -283,7 +422,10 @@ class TwitterFeedListener(commands.Cog):
     async def twitterfeed(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         await self.fetch_and_post_tweets()
-        await interaction.followup.send("✅ Twitter feed import finished.", ephemeral=True)
+        await interaction.followup.send(
+            f"✅ Twitter feed import finished (max event loop lag during import: {self.loop_lag.window_max * 1000:.0f} ms).",
+            ephemeral=True,
+        )
 
 
 async def setup(bot):
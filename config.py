@@ -11,3 +11,9 @@ TASKS_CHANNEL_ID = {
 }
 CARDS = ["None", "Village", "Forest", "Crystal Forest"]
 CARDS = ["None", "Village", "Forest", "Crystal Forest"]
+
+# Index local des tâches (titre -> message Discord), chargé au démarrage
+TASK_INDEX_FILE = "data/task_index.json"
+
+# Base des rappels de tâches (job store persistant d'APScheduler)
+TASK_REMINDERS_DB = "sqlite:///data/task_reminders.sqlite"
@@ -2,6 +2,13 @@
 from typing import Dict, List
 from config import UNAUTHORIZED_ROLE_ID
 
+# Fichier JSON de règles, rechargeable à chaud avec /reloadmoderation.
+# Clés possibles : role_ids, block_mentions, block_links, allowed_domains,
+# denied_domains, banned_words, banned_words_whole_word, warning_message,
+# auto_response_groups.
+# Toute clé absente (ou le fichier entier) reprend les valeurs ci-dessous.
+MOD_RULES_FILE = "data/moderation_rules.json"
+
 # Liste des rôles (IDs) auxquels la modération s'applique
 # Remplacez par les IDs voulus (ex: [123456789012345678])
 MOD_ROLE_IDS: List[int] = [UNAUTHORIZED_ROLE_ID]
@@ -10,20 +17,59 @@ MOD_ROLE_IDS: List[int] = [UNAUTHORIZED_ROLE_ID]
 MOD_BLOCK_MENTIONS: bool = True
 MOD_BLOCK_LINKS: bool = True
 
+# Politique de liens (domaines, sous-domaines inclus ; le plus spécifique l'emporte).
+# Avec MOD_BLOCK_LINKS = True, tout lien hors de MOD_LINK_ALLOWED_DOMAINS est
+# supprimé ; avec False, seuls les domaines de MOD_LINK_DENIED_DOMAINS le sont.
+MOD_LINK_ALLOWED_DOMAINS: List[str] = [
+    "pirpg.netlify.app",
+    "discord.gg",
+]
+MOD_LINK_DENIED_DOMAINS: List[str] = []
+
 # Mots/phrases interdits (suppressions automatiques)
 MOD_BANNED_WORDS: List[str] = [
     "badword1",
     "badword2",
 ]
 
+# Si True, un mot interdit n'est détecté que comme mot entier
+# (« ass » ne bloque pas « class »)
+MOD_BANNED_WORDS_WHOLE_WORD: bool = False
+
 # Message d'avertissement post-suppression (affiché brièvement)
 MOD_WARNING_MESSAGE: str = "Auto-mod ❌"
 
+# --- Anti-flood / mode raid (rôles surveillés uniquement) ---
+# Un membre qui envoie MOD_FLOOD_USER_LIMIT messages en MOD_FLOOD_USER_WINDOW
+# secondes voit ses messages supprimés comme des infractions.
+MOD_FLOOD_USER_LIMIT: int = 5
+MOD_FLOOD_USER_WINDOW: float = 5.0
+# Un salon qui reçoit MOD_RAID_CHANNEL_LIMIT messages de rôles surveillés en
+# MOD_RAID_CHANNEL_WINDOW secondes passe en mode raid pendant MOD_RAID_DURATION.
+MOD_RAID_CHANNEL_LIMIT: int = 15
+MOD_RAID_CHANNEL_WINDOW: float = 10.0
+MOD_RAID_DURATION: float = 120.0
+# En mode raid, les infractions sont supprimées par lots (delete_messages)
+# toutes les MOD_BULK_DELETE_DELAY secondes, avec un seul avertissement par lot.
+MOD_BULK_DELETE_DELAY: float = 2.0
+# Au plus un avertissement par salon sur cette fenêtre (secondes)
+MOD_WARNING_WINDOW: float = 10.0
+
+# --- Trace des décisions (/modtrace) ---
+# Les messages supprimés ou ayant reçu une réponse sont toujours tracés ;
+# les autres avec cette probabilité. Seules les MOD_TRACE_SIZE dernières
+# entrées sont gardées en mémoire.
+MOD_TRACE_SIZE: int = 200
+MOD_TRACE_SAMPLE_RATE: float = 0.01
+MOD_TRACE_CONTENT_CHARS: int = 100
+
 # --- Réponses automatiques ---
 # Mapping simple : déclencheur (chaîne) -> réponse (chaîne)
 # Le déclencheur est cherché dans le message (sensible à la casse selon
 # AUTO_RESPONSES_CASE_SENSITIVE). Vous pouvez utiliser des clés courtes
 # ou des phrases complètes.
+# Clé optionnelle par groupe : "whole_word": True pour ne déclencher que sur
+# des mots entiers (« hi » ne déclenche alors plus sur « this »).
 AUTO_RESPONSE_GROUPS = {
     "greetings": {
         "triggers": ["bonjour", "salut", "hello", "hi", "hey"],
@@ -58,3 +104,7 @@ AUTO_RESPONSES_CASE_SENSITIVE: bool = False
 # Les réponses peuvent contenir le placeholder '{user}' qui sera remplacé
 # par la mention de l'auteur.
 AUTO_RESPONSE_STATE_FILE = "data/auto_response_state.json"
+
+# Intervalle (secondes) entre deux écritures de l'état des quotas sur disque.
+# L'état est aussi écrit à l'arrêt du bot.
+AUTO_RESPONSE_FLUSH_SECONDS: int = 30
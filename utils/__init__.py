@@ -0,0 +1 @@
+"""Outils partagés par les extensions de commands/ (pas des extensions eux-mêmes)."""
@@ -0,0 +1,27 @@
+"""Client HTTP partagé par tout le bot (pool de connexions, keep-alive, cache DNS)."""
+import aiohttp
+
+# Connexions simultanées au total et par hôte (cdn de Twitter, Reddit, GitHub...)
+HTTP_POOL_LIMIT = 64
+HTTP_PER_HOST_LIMIT = 8
+# Durée de vie du cache DNS et des connexions inactives gardées ouvertes (secondes)
+HTTP_DNS_CACHE_SECONDS = 300
+HTTP_KEEPALIVE_SECONDS = 30
+# Délais communs à toutes les requêtes ; sock_read borne un flux bloqué
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=10, sock_read=30)
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Session unique, créée dans `setup_hook` (il faut une boucle active) et fermée avec le bot."""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_PER_HOST_LIMIT,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+
+
+def get_http_session(bot) -> aiohttp.ClientSession:
+    """Session partagée du bot, à utiliser par les cogs au lieu d'ouvrir la leur."""
+    return bot.http_session
@@ -0,0 +1,126 @@
+"""Politique de liens : extraction des domaines d'un texte et listes autorisé / interdit."""
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+ALLOW = "allow"
+DENY = "deny"
+
+_LABEL = r"[^\W_](?:[\w-]{0,61}[^\W_])?"
+_HOST = r"(?:" + _LABEL + r"\.)+[^\W\d_]{2,63}|\d{1,3}(?:\.\d{1,3}){3}"
+# Points pleine chasse et idéographiques, que les navigateurs lisent comme « . »
+_DOTS = str.maketrans({"\u3002": ".", "\uff0e": ".", "\uff61": "."})
+# Un seul passage sur le texte : URLs avec schéma (y compris dans les liens
+# markdown et les <liens sans aperçu>), « www. » et domaines nus. Un domaine
+# nu n'est un lien que suivi d'un chemin ou d'un port : sinon « welcome.to
+# the team » ou « fichier.txt » passeraient pour des liens. Après un
+# schéma, toute l'autorité est capturée puis analysée à part, pour qu'un hôte
+# illisible (« localhost », « 3232235777 », « [::1] », « evil.c0m ») ne
+# disparaisse pas du résultat.
+_LINK_RE = re.compile(
+    r"(?<![\w@.-])(?:"
+    r"(?P<scheme>[a-z][a-z0-9+.-]*)://(?:[^\s/@<>()\[\]]+@)?"
+    r"(?P<authority>\[[^\s\]]*\][^\s/?#<>()\[\],;!'\"]*|[^\s/?#<>()\[\],;!'\"]+)"
+    r"(?:[/?#][^\s<>()\[\]]*)?"
+    r"|(?P<host>" + _HOST + r")\.?"
+    r"(?P<port>:\d{1,5})?"
+    r"(?P<path>[/?#][^\s<>()\[\]]*)?"
+    r")",
+    re.IGNORECASE,
+)
+_AUTHORITY_RE = re.compile(r"(?P<host>" + _HOST + r")\.?(?::\d{0,5})?", re.IGNORECASE)
+
+
+def iter_hosts(text: str) -> Iterator[Tuple[str, bool]]:
+    """(hôte en minuscules, lisible) pour chaque lien du texte, dans l'ordre d'apparition.
+
+    Un hôte illisible (après un schéma seulement) est rendu tel qu'écrit,
+    avec `False` : il ne peut pas être comparé aux listes de domaines.
+    """
+    for match in _LINK_RE.finditer(text.translate(_DOTS)):
+        authority = match.group("authority")
+        if authority is not None:
+            parsed = _AUTHORITY_RE.fullmatch(authority)
+            if parsed:
+                yield parsed.group("host").lower(), True
+            else:
+                yield authority.lower(), False
+            continue
+        host = match.group("host").lower()
+        if match.group("path") or match.group("port") or host.startswith("www."):
+            yield host, True
+
+
+def extract_hosts(text: str) -> List[str]:
+    """Domaines (en minuscules) des liens présents dans le texte, dans l'ordre d'apparition."""
+    return [host for host, _ in iter_hosts(text)]
+
+
+class DomainSuffixTrie:
+    """Trie des domaines indexés par labels inversés (« com » -> « example » -> « www »).
+
+    Une règle sur « example.com » couvre aussi ses sous-domaines ; la règle
+    la plus spécifique l'emporte. Une recherche parcourt au plus un nœud par
+    label de l'hôte, quelle que soit la taille des listes.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self):
+        # nœud : {label: nœud}, la clé None porte le verdict
+        self._root: Dict = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, domain: str, verdict: str):
+        labels = domain.strip().strip(".").lower().split(".")
+        node = self._root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        if None not in node:
+            self._size += 1
+        # Un domaine à la fois autorisé et interdit reste interdit
+        if node.get(None) != DENY:
+            node[None] = verdict
+
+    def lookup(self, host: str) -> Optional[str]:
+        """Verdict du suffixe le plus long qui correspond à `host`, ou None."""
+        node = self._root
+        verdict = None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            verdict = node.get(None, verdict)
+        return verdict
+
+
+class LinkPolicy:
+    """Décide quels liens d'un message sont interdits.
+
+    Les domaines interdits sont toujours bloqués. Si `block_unlisted` est
+    vrai, tout domaine non autorisé l'est aussi, ainsi que toute URL dont
+    l'hôte est illisible.
+    """
+
+    def __init__(self, allowed: Iterable[str] = (), denied: Iterable[str] = (), block_unlisted: bool = True):
+        denied = list(denied)
+        self.block_unlisted = block_unlisted
+        self.domains = DomainSuffixTrie()
+        for domain in allowed:
+            self.domains.add(domain, ALLOW)
+        for domain in denied:
+            self.domains.add(domain, DENY)
+        # Rien ne peut être bloqué : inutile de parcourir le texte
+        self.active = block_unlisted or bool(denied)
+
+    def blocked_hosts(self, text: str) -> List[str]:
+        if not self.active:
+            return []
+        blocked = []
+        for host, parsed in iter_hosts(text):
+            verdict = self.domains.lookup(host) if parsed else None
+            if verdict == DENY or (verdict is None and self.block_unlisted):
+                blocked.append(host)
+        return blocked
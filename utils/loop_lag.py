@@ -0,0 +1,45 @@
+"""Mesure du retard de la boucle asyncio (appels bloquants, calculs trop longs)."""
+import asyncio
+
+
+class LoopLagMonitor:
+    """Tâche de fond qui dort `interval` secondes et mesure de combien elle se réveille en retard.
+
+    Tant que rien ne bloque la boucle, le retard reste de l'ordre de la
+    milliseconde ; un appel synchrone de N secondes apparaît comme un retard
+    d'environ N secondes. `window_max` est le pire retard depuis le dernier
+    `reset_window()`, pour mesurer une opération précise.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.last = 0.0
+        self.max = 0.0
+        self.window_max = 0.0
+        self.samples = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def reset_window(self):
+        self.window_max = 0.0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.last = lag
+            self.samples += 1
+            if lag > self.max:
+                self.max = lag
+            if lag > self.window_max:
+                self.window_max = lag
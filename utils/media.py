@@ -0,0 +1,56 @@
+"""Téléchargement de médias en flux, vers un fichier temporaire plafonné."""
+import tempfile
+
+import aiohttp
+
+CHUNK_SIZE = 64 * 1024
+# Au-delà, le fichier temporaire passe de la mémoire au disque
+SPOOL_MEMORY_LIMIT = 1024 * 1024
+
+
+class MediaTooLarge(Exception):
+    """Le média dépasse la taille autorisée (annoncée ou constatée pendant le flux)."""
+
+
+class MediaDownloadError(Exception):
+    """Réponse HTTP inattendue pour un média."""
+
+
+async def download_to_spool(session: aiohttp.ClientSession, url: str, max_bytes: int, chunk_size: int = CHUNK_SIZE):
+    """Télécharge `url` par morceaux dans un SpooledTemporaryFile remis au début.
+
+    Abandonne dès l'en-tête si `Content-Length` dépasse `max_bytes`, sinon dès
+    que le flux le dépasse : la mémoire utilisée est bornée par le morceau
+    (et le seuil du fichier temporaire), pas par la taille du média.
+    L'appelant ferme le fichier retourné.
+    """
+    async with session.get(url) as resp:
+        if resp.status != 200:
+            raise MediaDownloadError(f"HTTP {resp.status} for {url}")
+        if resp.content_length is not None and resp.content_length > max_bytes:
+            raise MediaTooLarge(f"{resp.content_length} bytes announced, limit {max_bytes}")
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT)
+        try:
+            size = 0
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise MediaTooLarge(f"more than {max_bytes} bytes received")
+                spool.write(chunk)
+            spool.seek(0)
+            return spool
+        except BaseException:
+            spool.close()
+            raise
+
+
+async def download_first_fitting(session: aiohttp.ClientSession, urls, max_bytes: int):
+    """Essaie les URLs dans l'ordre (variante la plus lourde d'abord) ; retourne (url, fichier) ou (None, None)."""
+    for url in urls:
+        try:
+            return url, await download_to_spool(session, url, max_bytes)
+        except MediaTooLarge as e:
+            print(f"[Media] {url} trop lourd ({e}), variante suivante")
+        except (MediaDownloadError, aiohttp.ClientError) as e:
+            print(f"[Media] Échec du téléchargement de {url}: {e}")
+    return None, None
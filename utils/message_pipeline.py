@@ -0,0 +1,112 @@
+"""Pipeline unique de traitement des messages : classification du salon puis dispatch."""
+import asyncio
+import time
+
+import discord
+
+# Catégorie Discord contenant les tickets (voir commands/reaction.py)
+TICKET_CATEGORY_NAME = "Public"
+TICKET_CHANNEL_PREFIX = "ticket-"
+
+# Étiquettes de salon
+TICKET = "ticket"      # salon dont le nom commence par "ticket-"
+PUBLIC = "public"      # salon de la catégorie TICKET_CATEGORY_NAME
+ORDINARY = "ordinary"  # ni l'un ni l'autre
+
+
+class HandlerStats:
+    __slots__ = ("calls", "errors", "total", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed: float, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    @property
+    def average(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class MessagePipeline:
+    """Classe chaque message une seule fois et ne l'envoie qu'aux handlers concernés.
+
+    Les filtres communs (bots, messages privés) sont appliqués ici. Les
+    étiquettes d'un salon sont mises en cache par ID, et la liste des
+    handlers est précalculée par combinaison d'étiquettes. Les handlers d'un
+    même message s'exécutent en parallèle, chacun chronométré séparément.
+    """
+
+    def __init__(self):
+        # nom -> (handler, étiquettes requises (une suffit), étiquettes exclues)
+        self._handlers = {}
+        self._channel_tags = {}
+        self._routes = {}
+        self.stats = {}
+        self.classify_stats = HandlerStats()
+
+    def register(self, name: str, handler, when=(PUBLIC, ORDINARY, TICKET), unless=()):
+        """Enregistre `handler(message)` pour les salons portant une étiquette de `when` et aucune de `unless`."""
+        self._handlers[name] = (handler, frozenset(when), frozenset(unless))
+        self.stats.setdefault(name, HandlerStats())
+        self._routes.clear()
+
+    def unregister(self, name: str):
+        self._handlers.pop(name, None)
+        self._routes.clear()
+
+    def tags(self, channel) -> frozenset:
+        tags = self._channel_tags.get(channel.id)
+        if tags is None:
+            found = set()
+            if getattr(channel, "name", "").startswith(TICKET_CHANNEL_PREFIX):
+                found.add(TICKET)
+            category = getattr(channel, "category", None)
+            if category is not None and category.name == TICKET_CATEGORY_NAME:
+                found.add(PUBLIC)
+            tags = self._channel_tags[channel.id] = frozenset(found or {ORDINARY})
+        return tags
+
+    def invalidate_channel(self, channel_id: int):
+        self._channel_tags.pop(channel_id, None)
+
+    def _route(self, tags: frozenset):
+        route = self._routes.get(tags)
+        if route is None:
+            route = self._routes[tags] = [
+                (name, handler)
+                for name, (handler, when, unless) in self._handlers.items()
+                if tags & when and not tags & unless
+            ]
+        return route
+
+    async def _run_handler(self, name: str, handler, message: discord.Message):
+        start = time.perf_counter()
+        failed = False
+        try:
+            await handler(message)
+        except Exception as e:
+            failed = True
+            print(f"[MessagePipeline] Erreur dans le handler {name}: {e}")
+        self.stats[name].record(time.perf_counter() - start, failed)
+
+    async def dispatch(self, message: discord.Message):
+        if message.author.bot or not message.guild:
+            return
+        start = time.perf_counter()
+        route = self._route(self.tags(message.channel))
+        self.classify_stats.record(time.perf_counter() - start, False)
+        # Les handlers sont indépendants : un appel REST lent n'en retarde pas d'autres
+        if len(route) == 1:
+            await self._run_handler(*route[0], message)
+        elif route:
+            await asyncio.gather(*(self._run_handler(name, handler, message) for name, handler in route))
+
+pipeline = MessagePipeline()
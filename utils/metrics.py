@@ -0,0 +1,121 @@
+"""Métriques en mémoire : compteurs, histogrammes de latence et trace échantillonnée des décisions."""
+import random
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+
+
+class LatencyHistogram:
+    """Histogramme à seaux fixes (bornes en µs) : enregistrement O(log seaux), mémoire constante."""
+
+    BOUNDS_US = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        # Dernier seau : au-delà de la plus grande borne
+        self.buckets = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.buckets[bisect_left(self.BOUNDS_US, seconds * 1e6)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Borne haute (s) du seau contenant le percentile demandé ; `max` pour le dernier seau."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return self.BOUNDS_US[index] / 1e6 if index < len(self.BOUNDS_US) else self.max
+        return self.max
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class RuleStats:
+    __slots__ = ("evaluations", "hits", "latency")
+
+    def __init__(self):
+        self.evaluations = 0
+        self.hits = 0
+        self.latency = LatencyHistogram()
+
+    def observe(self, seconds: float, hit: bool):
+        self.evaluations += 1
+        self.hits += bool(hit)
+        self.latency.observe(seconds)
+
+
+class Metrics:
+    """Registre d'un cog : statistiques par règle et compteurs nommés."""
+
+    def __init__(self):
+        self.rules = {}
+        self.counters = Counter()
+
+    def rule(self, name: str) -> RuleStats:
+        stats = self.rules.get(name)
+        if stats is None:
+            stats = self.rules[name] = RuleStats()
+        return stats
+
+    def observe(self, name: str, seconds: float, hit: bool = False):
+        self.rule(name).observe(seconds, hit)
+
+    def inc(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def snapshot(self) -> dict:
+        """Copie sérialisable de toutes les métriques (latences en µs)."""
+        return {
+            "rules": {
+                name: {
+                    "evaluations": stats.evaluations,
+                    "hits": stats.hits,
+                    "avg_us": stats.latency.average * 1e6,
+                    "p50_us": stats.latency.percentile(50) * 1e6,
+                    "p95_us": stats.latency.percentile(95) * 1e6,
+                    "p99_us": stats.latency.percentile(99) * 1e6,
+                    "max_us": stats.latency.max * 1e6,
+                }
+                for name, stats in self.rules.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+class DecisionTrace:
+    """Dernières décisions dans un tampon borné.
+
+    Les décisions qui ont un effet (suppression, réponse) sont toujours
+    gardées ; les messages sans effet ne le sont qu'avec la probabilité
+    `sample_rate`, pour rester lisible sans journaliser tout le trafic.
+    """
+
+    def __init__(self, size: int = 200, sample_rate: float = 0.01):
+        self.sample_rate = sample_rate
+        self._entries = deque(maxlen=size)
+        self._random = random.random
+
+    def wants(self, decided: bool) -> bool:
+        return decided or self._random() < self.sample_rate
+
+    def add(self, **entry):
+        entry.setdefault("at", time.time())
+        self._entries.append(entry)
+
+    def recent(self, limit: int = 10):
+        """Les `limit` dernières entrées, de la plus récente à la plus ancienne."""
+        entries = list(self._entries)
+        return entries[::-1][:limit]
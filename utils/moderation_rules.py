@@ -0,0 +1,159 @@
+"""Règles de modération : lecture, validation et compilation en tables de recherche."""
+import json
+import os
+
+from utils.link_policy import LinkPolicy
+from utils.multi_match import MultiPatternMatcher
+
+# Clés acceptées dans le fichier de règles et leur type attendu
+RULE_TYPES = {
+    "role_ids": list,
+    "block_mentions": bool,
+    "block_links": bool,
+    "allowed_domains": list,
+    "denied_domains": list,
+    "banned_words": list,
+    "banned_words_whole_word": bool,
+    "warning_message": str,
+    "auto_response_groups": dict,
+}
+GROUP_TYPES = {
+    "triggers": list,
+    "responses": list,
+    "target_role_ids": list,
+    "case_sensitive": bool,
+    "whole_word": bool,
+    "daily_limit": int,
+}
+
+
+def default_rules() -> dict:
+    """Règles issues de config_moderation.py, utilisées quand le fichier de règles est absent."""
+    import config_moderation as cfg
+
+    return {
+        "role_ids": list(cfg.MOD_ROLE_IDS),
+        "block_mentions": cfg.MOD_BLOCK_MENTIONS,
+        "block_links": cfg.MOD_BLOCK_LINKS,
+        "allowed_domains": list(cfg.MOD_LINK_ALLOWED_DOMAINS),
+        "denied_domains": list(cfg.MOD_LINK_DENIED_DOMAINS),
+        "banned_words": list(cfg.MOD_BANNED_WORDS),
+        "banned_words_whole_word": cfg.MOD_BANNED_WORDS_WHOLE_WORD,
+        "warning_message": cfg.MOD_WARNING_MESSAGE,
+        "auto_response_groups": cfg.AUTO_RESPONSE_GROUPS,
+    }
+
+
+def _is_type(value, expected) -> bool:
+    # bool est une sous-classe d'int : True n'est pas un nombre valide ici
+    if expected is int and isinstance(value, bool):
+        return False
+    return isinstance(value, expected)
+
+
+def _check_ids(values, where: str):
+    if not all(_is_type(v, int) for v in values):
+        raise ValueError(f"{where} must only contain integer IDs")
+
+
+def _check_strings(values, where: str):
+    if not all(isinstance(v, str) and v for v in values):
+        raise ValueError(f"{where} must only contain non-empty strings")
+
+
+def validate_rules(raw) -> dict:
+    """Vérifie et complète les règles ; lève ValueError avec la raison si elles sont invalides."""
+    if not isinstance(raw, dict):
+        raise ValueError("rules must be a JSON object")
+    unknown = set(raw) - set(RULE_TYPES)
+    if unknown:
+        raise ValueError(f"unknown keys: {', '.join(sorted(unknown))}")
+    # Clés absentes : valeurs de config_moderation.py
+    rules = {**default_rules(), **raw}
+    for key, expected in RULE_TYPES.items():
+        if not _is_type(rules[key], expected):
+            raise ValueError(f"'{key}' must be of type {expected.__name__}")
+    _check_ids(rules["role_ids"], "role_ids")
+    _check_strings(rules["banned_words"], "banned_words")
+    _check_strings(rules["allowed_domains"], "allowed_domains")
+    _check_strings(rules["denied_domains"], "denied_domains")
+
+    for name, group in rules["auto_response_groups"].items():
+        if not isinstance(group, dict):
+            raise ValueError(f"group '{name}' must be an object")
+        unknown = set(group) - set(GROUP_TYPES)
+        if unknown:
+            raise ValueError(f"group '{name}': unknown keys: {', '.join(sorted(unknown))}")
+        for key, expected in GROUP_TYPES.items():
+            if key in group and not _is_type(group[key], expected):
+                raise ValueError(f"group '{name}': '{key}' must be of type {expected.__name__}")
+        if not group.get("triggers"):
+            raise ValueError(f"group '{name}' has no triggers")
+        _check_strings(group["triggers"], f"group '{name}': triggers")
+        _check_strings(group.get("responses", []), f"group '{name}': responses")
+        _check_ids(group.get("target_role_ids", []), f"group '{name}': target_role_ids")
+        if group.get("daily_limit", 1) < 1:
+            raise ValueError(f"group '{name}': daily_limit must be at least 1")
+    return rules
+
+
+class CompiledRules:
+    """Instantané immuable des règles, prêt à l'emploi sur le chemin des messages.
+
+    Le cog garde une seule référence vers l'instantané courant : un
+    rechargement en construit un nouveau à côté puis remplace la référence,
+    si bien qu'un message est toujours traité avec un jeu de règles complet.
+    """
+
+    __slots__ = (
+        "role_ids", "block_mentions", "link_policy", "warning_message",
+        "groups", "group_targets", "matcher", "source",
+    )
+
+    def __init__(self, rules: dict, source: str):
+        self.role_ids = frozenset(rules["role_ids"])
+        self.block_mentions = rules["block_mentions"]
+        # block_links : tout lien non autorisé est bloqué ; sinon seuls les domaines interdits
+        self.link_policy = LinkPolicy(
+            rules["allowed_domains"], rules["denied_domains"], block_unlisted=rules["block_links"]
+        )
+        self.warning_message = rules["warning_message"]
+        self.groups = rules["auto_response_groups"]
+        self.group_targets = {
+            name: frozenset(cfg.get("target_role_ids", [])) for name, cfg in self.groups.items()
+        }
+        self.matcher = compile_matcher(rules["banned_words"], self.groups, rules["banned_words_whole_word"])
+        self.source = source
+
+
+def compile_matcher(banned_words, groups, banned_whole_word: bool = False) -> MultiPatternMatcher:
+    """Compile mots interdits et déclencheurs en un seul automate.
+
+    Payloads : ("banned", mot) pour un mot interdit, ("group", nom) pour un
+    groupe de réponses automatiques.
+    """
+    matcher = MultiPatternMatcher()
+    for word in banned_words:
+        matcher.add(word, ("banned", word), whole_word=banned_whole_word)
+    for group_name, cfg in groups.items():
+        for trig in cfg.get("triggers", []):
+            matcher.add(
+                trig,
+                ("group", group_name),
+                case_sensitive=cfg.get("case_sensitive", False),
+                whole_word=cfg.get("whole_word", False),
+            )
+    return matcher.build()
+
+
+def load_rules(path: str) -> CompiledRules:
+    """Lit, valide et compile le fichier de règles (ou config_moderation.py s'il est absent).
+
+    Fonction bloquante (lecture disque et construction de l'automate) :
+    à appeler via `asyncio.to_thread` depuis la boucle.
+    """
+    if not os.path.exists(path):
+        return CompiledRules(validate_rules({}), "config_moderation.py")
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return CompiledRules(validate_rules(raw), path)
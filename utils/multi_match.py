@@ -0,0 +1,101 @@
+"""Recherche simultanée de nombreux motifs (automate d'Aho-Corasick)."""
+from collections import deque
+from typing import Any, Dict, List, Set
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class MultiPatternMatcher:
+    """Automate d'Aho-Corasick : un seul passage sur le texte trouve tous les motifs.
+
+    Les motifs sont indexés en minuscules ; un motif sensible à la casse est
+    revérifié sur le texte d'origine à la position trouvée. `whole_word`
+    exige que le motif ne soit pas collé à une lettre, un chiffre ou un `_`.
+    Le coût d'une recherche dépend de la longueur du texte et du nombre de
+    correspondances, pas du nombre de motifs.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Pour chaque état, indices des motifs qui se terminent ici (sorties fusionnées)
+        self._out: List[List[int]] = [[]]
+        # (motif, longueur indexée, payload, sensible à la casse, mot entier)
+        self._patterns: List[tuple] = []
+        self._built = False
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def add(self, pattern: str, payload: Any, case_sensitive: bool = False, whole_word: bool = False):
+        if not pattern:
+            return
+        if self._built:
+            raise RuntimeError("cannot add patterns after build()")
+        lowered = pattern.lower()
+        state = 0
+        for char in lowered:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._patterns))
+        self._patterns.append((pattern, len(lowered), payload, case_sensitive, whole_word))
+
+    def build(self) -> "MultiPatternMatcher":
+        """Calcule les liens d'échec (parcours en largeur) ; à appeler une fois après les `add`."""
+        # Les fils de la racine échouent vers la racine (déjà initialisé à 0)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def find(self, text: str) -> Set[Any]:
+        """Ensemble des payloads dont au moins un motif apparaît dans `text`."""
+        if not self._built:
+            self.build()
+        lowered = text.lower()
+        # lower() peut changer la longueur de certains caractères Unicode :
+        # les positions ne sont alors plus alignées avec le texte d'origine
+        aligned = len(lowered) == len(text)
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        found: Set[Any] = set()
+        state = 0
+        for end, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            for pid in out[state]:
+                pattern, length, payload, case_sensitive, whole_word = patterns[pid]
+                if payload in found:
+                    continue
+                start = end - length + 1
+                if case_sensitive:
+                    if aligned:
+                        if text[start:end + 1] != pattern:
+                            continue
+                    elif pattern not in text:
+                        continue
+                if whole_word:
+                    if start > 0 and _is_word_char(lowered[start - 1]):
+                        continue
+                    if end + 1 < len(lowered) and _is_word_char(lowered[end + 1]):
+                        continue
+                found.add(payload)
+        return found
@@ -0,0 +1,64 @@
+"""Quotas journaliers par (groupe, utilisateur), rangés par jour."""
+from datetime import date
+
+
+class DailyQuota:
+    """Compteurs groupe -> utilisateur -> nombre d'utilisations, rangés dans un seul seau par jour.
+
+    Seul le seau du jour courant est conservé : au changement de date, les
+    seaux précédents sont évincés d'un bloc. La mémoire et la taille du
+    fichier restent donc proportionnelles aux utilisateurs actifs du jour,
+    et chaque vérification est un accès dictionnaire.
+    """
+
+    def __init__(self, buckets=None):
+        # jour ISO -> groupe -> user_id (str) -> nombre
+        self._buckets = buckets or {}
+
+    @classmethod
+    def from_state(cls, state):
+        """Construit le quota depuis l'état persistant, y compris l'ancien format groupe -> user_id -> date."""
+        state = state or {}
+        if "buckets" in state:
+            quota = cls(state["buckets"])
+        else:
+            # Ancien format : seule la date de la dernière réponse était stockée
+            quota = cls()
+            today = date.today().isoformat()
+            for group, users in state.items():
+                if not isinstance(users, dict):
+                    continue
+                for uid, last in users.items():
+                    if last == today:
+                        quota._buckets.setdefault(today, {}).setdefault(group, {})[uid] = 1
+        quota.evict()
+        return quota
+
+    def to_state(self):
+        return {"buckets": self._buckets}
+
+    def evict(self, today: str = None) -> bool:
+        """Supprime les seaux des jours passés ; retourne True si quelque chose a été évincé."""
+        today = today or date.today().isoformat()
+        expired = [day for day in self._buckets if day != today]
+        for day in expired:
+            del self._buckets[day]
+        return bool(expired)
+
+    def _today_bucket(self):
+        today = date.today().isoformat()
+        bucket = self._buckets.get(today)
+        if bucket is None:
+            self.evict(today)
+            bucket = self._buckets[today] = {}
+        return bucket
+
+    def count(self, group: str, uid: str) -> int:
+        return self._today_bucket().get(group, {}).get(uid, 0)
+
+    def allowed(self, group: str, uid: str, limit: int) -> bool:
+        return self.count(group, uid) < limit
+
+    def hit(self, group: str, uid: str):
+        users = self._today_bucket().setdefault(group, {})
+        users[uid] = users.get(uid, 0) + 1
@@ -0,0 +1,61 @@
+"""Primitives de limitation de débit."""
+import asyncio
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """Seau à jetons : au plus `rate` opérations par fenêtre de `per` secondes, en rafale lissée."""
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.rate, self._tokens + elapsed * self.rate / self.per)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Consomme un jeton si disponible, sans attendre."""
+        self._refill(time.monotonic())
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self):
+        """Attend qu'un jeton soit disponible puis le consomme."""
+        while not self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+
+
+class SlidingWindowCounter:
+    """Détection de rafales : au moins `limit` événements en `window` secondes, par clé.
+
+    Chaque clé garde un tampon circulaire des `limit` derniers horodatages :
+    la limite est atteinte quand le plus ancien d'entre eux est encore dans
+    la fenêtre. Chaque événement coûte O(1), quelle que soit la fenêtre.
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._hits = {}
+
+    def hit(self, key, now: float = None) -> bool:
+        """Enregistre un événement ; retourne True si la limite est atteinte."""
+        now = time.monotonic() if now is None else now
+        ring = self._hits.get(key)
+        if ring is None:
+            ring = self._hits[key] = deque(maxlen=self.limit)
+        ring.append(now)
+        return len(ring) == self.limit and now - ring[0] <= self.window
+
+    def prune(self, now: float = None):
+        """Oublie les clés sans événement dans la fenêtre (borne la mémoire)."""
+        now = time.monotonic() if now is None else now
+        for key in [k for k, ring in self._hits.items() if now - ring[-1] > self.window]:
+            del self._hits[key]
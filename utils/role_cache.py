@@ -0,0 +1,81 @@
+"""Cache des rôles des membres, partagé par les cogs qui filtrent par rôle."""
+import discord
+from discord.ext import commands
+
+
+class MemberRoleCache:
+    """(guild_id, member_id) -> frozenset des IDs de rôles.
+
+    Le filtrage par rôle devient une seule intersection d'ensembles. Les
+    entrées sont invalidées par le cog RoleCache sur les événements qui
+    changent les rôles d'un membre.
+    """
+
+    def __init__(self):
+        self._roles = {}
+        # guild_id -> {nom de rôle: frozenset des IDs portant ce nom}
+        self._names = {}
+
+    def role_ids(self, member) -> frozenset:
+        key = (getattr(member.guild, "id", None), member.id)
+        roles = self._roles.get(key)
+        if roles is None:
+            roles = self._roles[key] = frozenset(r.id for r in getattr(member, "roles", ()))
+        return roles
+
+    def ids_for_names(self, guild, names) -> frozenset:
+        """IDs des rôles du serveur portant l'un des noms donnés (résolus une fois par serveur)."""
+        by_name = self._names.get(guild.id)
+        if by_name is None:
+            by_name = {}
+            for role in guild.roles:
+                by_name[role.name] = by_name.get(role.name, frozenset()) | {role.id}
+            self._names[guild.id] = by_name
+        return frozenset().union(*(by_name.get(name, frozenset()) for name in names))
+
+    def invalidate_member(self, member):
+        self._roles.pop((getattr(member.guild, "id", None), member.id), None)
+
+    def invalidate_guild(self, guild_id: int):
+        self._names.pop(guild_id, None)
+        for key in [k for k in self._roles if k[0] == guild_id]:
+            del self._roles[key]
+
+
+member_roles = MemberRoleCache()
+
+
+class RoleCache(commands.Cog):
+    """Invalide `member_roles` ; ajouté une seule fois par le premier cog qui en a besoin."""
+
+    def __init__(self, bot: commands.Bot, cache: MemberRoleCache = member_roles):
+        self.bot = bot
+        self.cache = cache
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            self.cache.invalidate_member(after)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.cache.invalidate_member(member)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self.cache.invalidate_guild(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            self.cache.invalidate_guild(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        # Les membres perdent le rôle sans recevoir d'on_member_update
+        self.cache.invalidate_guild(role.guild.id)
+
+
+async def ensure_role_cache(bot: commands.Bot):
+    if bot.get_cog("RoleCache") is None:
+        await bot.add_cog(RoleCache(bot))
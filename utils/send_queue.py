@@ -0,0 +1,56 @@
+"""File d'envoi de messages cadencée par salon."""
+import asyncio
+
+from utils.rate_limit import TokenBucket
+
+# Limite d'envoi de Discord par salon : environ 5 messages toutes les 5 secondes
+CHANNEL_RATE = 5
+CHANNEL_PER = 5.0
+
+
+class ChannelSendQueue:
+    """Envoie des messages via une file bornée par salon.
+
+    Chaque salon a son propre worker et son propre seau à jetons : un salon
+    saturé ne retarde pas les autres, et `submit` bloque quand la file d'un
+    salon est pleine (contre-pression sur le producteur).
+    """
+
+    def __init__(self, rate: int = CHANNEL_RATE, per: float = CHANNEL_PER, maxsize: int = 20):
+        self._rate = rate
+        self._per = per
+        self._maxsize = maxsize
+        self._queues = {}
+        self._workers = []
+
+    async def _worker(self, queue: asyncio.Queue, bucket: TokenBucket):
+        while True:
+            channel, kwargs, future = await queue.get()
+            try:
+                await bucket.acquire()
+                future.set_result(await channel.send(**kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    async def submit(self, channel, **kwargs) -> asyncio.Future:
+        """Met en file un `channel.send(**kwargs)` ; le futur retourné porte le message envoyé."""
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = asyncio.Queue(maxsize=self._maxsize)
+            bucket = TokenBucket(self._rate, self._per)
+            self._workers.append(asyncio.create_task(self._worker(queue, bucket)))
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((channel, kwargs, future))
+        return future
+
+    async def close(self):
+        """Attend la fin des envois en cours puis arrête les workers."""
+        for queue in self._queues.values():
+            await queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queues.clear()
+        self._workers.clear()
@@ -0,0 +1,78 @@
+"""Persistance JSON différée (write-behind) et atomique."""
+import os
+import json
+import asyncio
+import tempfile
+from datetime import datetime
+
+
+def write_atomic(path: str, payload: str):
+    """Écrit dans un fichier temporaire du même dossier puis le renomme : jamais de fichier à moitié écrit."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class JsonStateStore:
+    """État JSON marqué « sale » à chaque modification et écrit plus tard, hors de la boucle.
+
+    `snapshot` retourne l'objet à sérialiser. La sérialisation est faite sur
+    la boucle (instantané cohérent), l'écriture disque dans un thread.
+    Le propriétaire appelle `flush()` périodiquement et à l'arrêt.
+    """
+
+    def __init__(self, path: str, snapshot, label: str = "StateStore"):
+        self.path = path
+        self._snapshot = snapshot
+        self._label = label
+        self._dirty = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def load(self, default=None):
+        """Lit le fichier ; un fichier corrompu est mis de côté (`.corrupt-<date>`) au lieu d'être écrasé."""
+        if not os.path.exists(self.path):
+            return default
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            backup = f"{self.path}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            print(f"[{self._label}] Fichier {self.path} illisible ({e}), sauvegardé sous {backup}")
+            try:
+                os.replace(self.path, backup)
+            except OSError:
+                pass
+            return default
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    async def flush(self):
+        """Écrit l'état s'il a changé depuis la dernière écriture."""
+        async with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._snapshot(), ensure_ascii=False, separators=(",", ":"))
+            # Les modifications faites pendant l'écriture re-marqueront l'état
+            self._dirty = False
+            try:
+                await asyncio.to_thread(write_atomic, self.path, payload)
+            except Exception as e:
+                self._dirty = True
+                print(f"[{self._label}] Impossible d'enregistrer {self.path}: {e}")
@@ -0,0 +1,134 @@
+"""Recherche de titres pour l'autocomplétion : trie de préfixes + classement flou par trigrammes."""
+import heapq
+from itertools import islice
+from collections import Counter
+from typing import Dict, List, Set
+
+_END = "\0"
+# Nombre maximal d'entrées de listes de trigrammes parcourues par requête floue :
+# borne le coût indépendamment de la taille de l'index
+_FUZZY_POSTINGS_BUDGET = 800
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleSearch:
+    """Index en mémoire de titres.
+
+    - trie des titres normalisés, indexés à chaque début de mot : un préfixe
+      tapé par l'utilisateur retrouve « Hero sprite » via « her » ou « spr » ;
+    - index inversé de trigrammes pour tolérer les fautes de frappe quand
+      les préfixes ne donnent pas assez de résultats.
+    """
+
+    def __init__(self):
+        self._trie: Dict = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._trigram_counts: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._trigram_counts)
+
+    def __contains__(self, title: str):
+        return title in self._trigram_counts
+
+    def _suffixes(self, title: str):
+        norm = _normalize(title)
+        yield norm
+        for i, char in enumerate(norm):
+            if char == " ":
+                yield norm[i + 1:]
+
+    def add(self, title: str):
+        if title in self._trigram_counts:
+            return
+        for key in self._suffixes(title):
+            node = self._trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault(_END, set()).add(title)
+        grams = _trigrams(_normalize(title))
+        for gram in grams:
+            self._trigrams.setdefault(gram, set()).add(title)
+        self._trigram_counts[title] = len(grams)
+
+    def remove(self, title: str):
+        if title not in self._trigram_counts:
+            return
+        del self._trigram_counts[title]
+        for key in self._suffixes(title):
+            node = self._trie
+            for char in key:
+                node = node.get(char)
+                if node is None:
+                    break
+            else:
+                node.get(_END, set()).discard(title)
+        for gram in _trigrams(_normalize(title)):
+            titles = self._trigrams.get(gram)
+            if titles is not None:
+                titles.discard(title)
+                if not titles:
+                    del self._trigrams[gram]
+
+    def _prefix_matches(self, prefix: str, limit: int, out: List[str], seen: Set[str]):
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [node]
+        while stack and len(out) < limit:
+            node = stack.pop()
+            for title in node.get(_END, ()):
+                if title not in seen:
+                    seen.add(title)
+                    out.append(title)
+                    if len(out) >= limit:
+                        return
+            stack.extend(child for char, child in node.items() if char != _END)
+
+    def _fuzzy_matches(self, query: str, limit: int, out: List[str], seen: Set[str]):
+        grams = _trigrams(query)
+        # Les trigrammes les plus rares sont les plus discriminants : on les
+        # parcourt en premier, dans la limite du budget
+        postings = sorted((self._trigrams[g] for g in grams if g in self._trigrams), key=len)
+        hits = Counter()
+        budget = _FUZZY_POSTINGS_BUDGET
+        for titles in postings:
+            if budget <= 0:
+                break
+            hits.update(islice(titles, budget))
+            budget -= len(titles)
+        # Similarité de Jaccard sur les trigrammes
+        ranked = heapq.nlargest(
+            limit + len(seen),
+            hits.items(),
+            key=lambda item: item[1] / (len(grams) + self._trigram_counts[item[0]] - item[1]),
+        )
+        for title, _ in ranked:
+            if len(out) >= limit:
+                return
+            if title not in seen:
+                seen.add(title)
+                out.append(title)
+
+    def suggest(self, query: str, limit: int = 25) -> List[str]:
+        """Titres correspondant à `query` : préfixes d'abord, puis correspondances floues."""
+        query = _normalize(query)
+        out: List[str] = []
+        seen: Set[str] = set()
+        if not query:
+            self._prefix_matches("", limit, out, seen)
+            return out
+        self._prefix_matches(query, limit, out, seen)
+        if len(out) < limit and len(query) >= 2:
+            self._fuzzy_matches(query, limit, out, seen)
+        return out
@@ -0,0 +1,34 @@
+"""Vues Discord communes."""
+import discord
+from discord import ui
+
+
+class AuthorView(ui.View):
+    """Vue réservée à l'auteur de la commande, nettoyée à l'expiration.
+
+    Remplace `client.wait_for("interaction")` : les composants sont routés
+    par discord.py vers cette seule vue, et la vue est retirée du
+    dispatcher au timeout ou à l'appel de `stop()`.
+    """
+
+    def __init__(self, author: discord.abc.User, timeout: float = 120,
+                 timeout_message: str = "❌ Timeout: no choice was made in time."):
+        super().__init__(timeout=timeout)
+        self.author_id = author.id
+        self.timeout_message = timeout_message
+        # Message portant la vue, à renseigner après l'envoi pour pouvoir le nettoyer
+        self.message = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ This menu is not for you.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+        try:
+            await self.message.edit(content=self.timeout_message, view=None)
+        except discord.HTTPException:
+            pass